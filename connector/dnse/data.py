@@ -1,28 +1,50 @@
 # Conversation: https://chatgpt.com/c/80dc51f6-51c6-475e-8987-f057c31f03da
 
 import os
+import queue
+import threading
 import argparse
 import requests
-import json
-import csv
 import logging
 import random
 import time
 import yaml
+import functools
 
+from requests.adapters import HTTPAdapter
 from paho.mqtt import client as mqtt_client
 from paho.mqtt.client import MQTTv5
 from paho.mqtt.subscribeoptions import SubscribeOptions
+from vnstock_data.connector.dnse.ticks import open_tick_writer, _process_tick, _validate_ticks
 
+try:
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    from json import loads as json_loads, dumps as json_dumps
 
-def append_tick_to_csv(tick_data, filename='tick_data.csv'):
-    fieldnames = ['symbol', 'matchPrice', 'matchQtty', 'time', 'side', 'session', 'low', 'open', 'lastUpdated', 'volume', 'close', 'type', 'high']
-    file_exists = os.path.isfile(filename)
-    with open(filename, 'a', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(tick_data)
+# libyaml-backed loader when available, it parses roughly an order of magnitude faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Shared HTTPS session so token and account lookups reuse the same TLS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_creds(path: str, mtime: float):
+    """
+    Parse the credentials file once per (path, mtime) so repeated calls skip the YAML parse.
+    """
+    with open(path, 'r') as f:
+        creds = yaml.load(f, Loader=_YamlLoader)
+        if not isinstance(creds, dict):
+            raise ValueError("The credentials file format is incorrect. Expected a dictionary.")
+        return creds['usr'], creds['pwd']
 
 
 def yaml_creds(path: str):
@@ -40,13 +62,7 @@ def yaml_creds(path: str):
     Tài liệu API: https://hdsd.dnse.com.vn/san-pham-dich-vu/api-lightspeed/iii.-market-data/2.-dac-ta-thong-tin-cac-message/2.1.-moi-truong
     """
     try:
-        with open(path, 'r') as f:
-            creds = yaml.safe_load(f)
-            if not isinstance(creds, dict):
-                raise ValueError("The credentials file format is incorrect. Expected a dictionary.")
-            username = creds['usr']
-            password = creds['pwd']
-        return username, password
+        return _load_creds(path, os.path.getmtime(path))
     except FileNotFoundError:
         raise FileNotFoundError(f"The file {path} does not exist.")
     except yaml.YAMLError as e:
@@ -80,17 +96,13 @@ class Auth:
         """
         url = "https://services.entrade.com.vn/dnse-user-service/api/auth"
 
-        payload = json.dumps({
+        payload = json_dumps({
             "username": self.username,
             "password": self.password
         })
-        headers = {
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = _SESSION.request("POST", url, headers=_JSON_HEADERS, data=payload)
         if response.status_code == 200:
-            return response.json()['token']
+            return json_loads(response.content)['token']
         else:
             response.raise_for_status()
 
@@ -100,13 +112,13 @@ class Auth:
         """
         url = "https://services.entrade.com.vn/dnse-user-service/api/me"
         headers = {
-            'Content-Type': 'application/json',
+            **_JSON_HEADERS,
             'authorization': f'Bearer {self.token}'
         }
 
-        response = requests.request("GET", url, headers=headers)
+        response = _SESSION.request("GET", url, headers=headers)
         if response.status_code == 200:
-            investor_data = response.json()
+            investor_data = json_loads(response.content)
             return investor_data['investorId']  # Adjust this line based on actual JSON structure
         else:
             response.raise_for_status()
@@ -115,12 +127,15 @@ class Config:
     """
     Application Configuration Class
     """
-    def __init__(self, creds_path: str, topics: tuple):
+    def __init__(self, creds_path: str, topics: tuple, qos: int = 2):
         self.user_name, self.password = yaml_creds(creds_path)
         self.auth = Auth(self.user_name, self.password)
         self.BROKER = 'datafeed-lts.dnse.com.vn'
         self.PORT = 443
         self.TOPICS = topics
+        # QoS 2 costs a four-packet handshake per message; QoS 0/1 raise receive throughput on busy wildcard topics
+        self.QOS = qos
+        self.SUBSCRIPTIONS = [(topic, SubscribeOptions(qos=self.QOS)) for topic in self.TOPICS]
         self.CLIENT_ID = f'python-json-mqtt-ws-sub-{random.randint(0, 1000)}'
         self.USERNAME = self.auth.investor_id
         self.PASSWORD = self.auth.token
@@ -133,8 +148,9 @@ class MQTTClient:
     """
     Class encapsulating MQTT Client related functionalities
     """
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, filename: str = 'tick_data.csv'):
         self.config = config
+        self.tick_writer = open_tick_writer(filename)
         self.client = mqtt_client.Client(client_id=self.config.CLIENT_ID, protocol=MQTTv5, transport='websockets')
         self.client.username_pw_set(self.config.USERNAME, self.config.PASSWORD)
         self.client.tls_set_context()
@@ -142,7 +158,14 @@ class MQTTClient:
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
         self.client.on_disconnect = self.on_disconnect
+        self.client.on_connect_fail = self.on_connect_fail
+        # The loop_start thread reconnects by itself; _count_reconnect sets a jittered wait before each attempt
         self.FLAG_EXIT = False
+        self._reconnect_count = 0
+
+        self.tick_queue = queue.Queue(maxsize=10000)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
 
     def connect_mqtt(self):
         self.client.connect(self.config.BROKER, self.config.PORT, keepalive=120)
@@ -151,59 +174,107 @@ class MQTTClient:
     def on_connect(self, client, userdata, flags, rc, properties=None):
         if rc == 0 and client.is_connected():
             logging.info("Connected to MQTT Broker!")
-            topic_tuple = [(topic, SubscribeOptions(qos=2)) for topic in self.config.TOPICS]
-            self.client.subscribe(topic_tuple)
+            self._reconnect_count = 0
+            self.client.subscribe(self.config.SUBSCRIPTIONS)
         else:
-            logging.error(f'Failed to connect, return code {rc}')
+            logging.error('Failed to connect, return code %s', rc)
 
     def on_disconnect(self, client, userdata, rc, properties=None):
         logging.info("Disconnected with result code: %s", rc)
-        reconnect_count, reconnect_delay = 0, self.config.FIRST_RECONNECT_DELAY
-        while reconnect_count < self.config.MAX_RECONNECT_COUNT:
-            logging.info("Reconnecting in %d seconds...", reconnect_delay)
-            time.sleep(reconnect_delay)
+        self._count_reconnect()
+
+    def on_connect_fail(self, client, userdata):
+        logging.error("Reconnect failed. Retrying...")
+        self._count_reconnect()
 
+    def _count_reconnect(self):
+        """
+        Set the wait before paho's next reconnect attempt with exponential backoff and full jitter,
+        so many clients dropped at once do not reconnect in lockstep.
+        Give up once MAX_RECONNECT_COUNT attempts have failed without a successful connection.
+        """
+        self._reconnect_count += 1
+        if self._reconnect_count > self.config.MAX_RECONNECT_COUNT:
+            logging.info("Reconnect failed after %s attempts. Exiting...", self.config.MAX_RECONNECT_COUNT)
+            self.FLAG_EXIT = True
+            return
+        cap = min(self.config.MAX_RECONNECT_DELAY,
+                  self.config.FIRST_RECONNECT_DELAY * self.config.RECONNECT_RATE ** (self._reconnect_count - 1))
+        delay = random.uniform(0, cap)
+        logging.info("Reconnecting in %.1f seconds...", delay)
+        # Equal bounds make paho wait exactly this long; setting them also resets its own doubling
+        self.client.reconnect_delay_set(min_delay=delay, max_delay=delay)
+
+    def _writer_loop(self):
+        """
+        Drain the tick queue in batches on a dedicated thread so disk writes never block the network loop.
+        """
+        while True:
+            try:
+                tick = self.tick_queue.get(timeout=self.tick_writer.flush_interval)
+            except queue.Empty:
+                self.tick_writer.flush()
+                continue
+            batch = [tick]
             try:
-                client.reconnect()
-                logging.info("Reconnected successfully!")
+                while len(batch) < self.tick_writer.batch_size:
+                    batch.append(self.tick_queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = None in batch
+            if stop:
+                batch = batch[:batch.index(None)]
+            if batch:
+                # A bad batch is logged and skipped so it cannot stop the writer thread
+                try:
+                    for tick in _validate_ticks(batch):
+                        self.tick_writer.write(tick)
+                except Exception:
+                    logging.exception("Failed to write a batch of %d tick(s).", len(batch))
+            if stop:
+                self.tick_writer.close()
                 return
-            except Exception as err:
-                logging.error("%s. Reconnect failed. Retrying...", err)
 
-            reconnect_delay *= self.config.RECONNECT_RATE
-            reconnect_delay = min(reconnect_delay, self.config.MAX_RECONNECT_DELAY)
-            reconnect_count += 1
-        logging.info("Reconnect failed after %s attempts. Exiting...", reconnect_count)
-        self.FLAG_EXIT = True
+    def close(self):
+        """
+        Stop the writer thread after the queued ticks are written and close the output file.
+        """
+        self.tick_queue.put(None)
+        self._writer_thread.join()
 
     def on_message(self, client, userdata, msg):
-        payload = json.loads(msg.payload.decode())
-        
-        # Perform cleaning and validation on payload here
-        # Example: Validate matchPrice and matchQtty exist and are numbers
-        
-        if 'matchPrice' in payload and 'matchQtty' in payload:
+        payload = json_loads(msg.payload)
+        tick = _process_tick(payload)
+        if tick is not None:
+            # Hand the tick over to the writer thread, dropping it if the writer falls too far behind
             try:
-                payload['matchPrice'] = float(payload['matchPrice'])
-                payload['matchQtty'] = float(payload['matchQtty'])
-                # Proceed to append data to CSV or directly to database
-                append_tick_to_csv(payload)
-                logging.debug(f"Received tick data: {payload}")
-            except ValueError:
-                logging.error("Invalid data format, skipping tick.")
-
-def run(creds_path, topics):
+                self.tick_queue.put_nowait(tick)
+            except queue.Full:
+                logging.warning("Tick queue is full, dropping tick.")
+                return
+            logging.debug("Received tick data: %s", tick)
+
+def run(creds_path, topics, output='tick_data.csv', qos=2):
     logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', level=logging.DEBUG)
-    config = Config(creds_path, topics)
-    my_mqtt_client = MQTTClient(config)
+    config = Config(creds_path, topics, qos)
+    my_mqtt_client = MQTTClient(config, output)
     client = my_mqtt_client.connect_mqtt()
-    client.loop_forever()
+    client.loop_start()
+    try:
+        while not my_mqtt_client.FLAG_EXIT:
+            time.sleep(1)
+    finally:
+        client.loop_stop()
+        my_mqtt_client.close()
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="MQTT Client CLI App")
     parser.add_argument('creds_path', type=str, help="Path to the creds.yaml file")
     parser.add_argument('--topics', type=str, nargs='+', default=["plaintext/quotes/derivative/OHLC/1/VN30F1M", "plaintext/quotes/stock/tick/+"], help="List of topics to subscribe to")
 
+    parser.add_argument('--output', type=str, default='tick_data.csv', help="Output file, use the .arrow extension to write an Arrow IPC stream")
+    parser.add_argument('--qos', type=int, choices=(0, 1, 2), default=2, help="Subscription QoS level, lower values trade delivery guarantees for throughput")
+
     args = parser.parse_args()
 
-    run(args.creds_path, tuple(args.topics))
\ No newline at end of file
+    run(args.creds_path, tuple(args.topics), args.output, args.qos)
\ No newline at end of file
@@ -4,52 +4,59 @@
 # Gói phụ thuộc: paho>=2.0.0 >> Chạy lệnh pip install paho để cài bản mới nhất.
 
 import requests
-import json
 import logging
 import random
 import time
-import os
-import csv
+import queue
+import threading
+from requests.adapters import HTTPAdapter
 from paho.mqtt import client as mqtt_client
 from paho.mqtt.client import MQTTv5
 from paho.mqtt.subscribeoptions import SubscribeOptions
+from vnstock_data.connector.dnse.ticks import open_tick_writer, _process_tick, _validate_ticks
 import yaml
 
-def append_tick_to_csv(tick_data, filename='tick_data.csv'):
-    # fieldnames = ['symbol', 'matchPrice', 'matchQtty', 'time', 'side', 'session']
-    fieldnames = ['symbol', 'matchPrice', 'matchQtty', 'time', 'side', 'session', 'low', 'open', 'lastUpdated', 'volume', 'close', 'type', 'high']
-    file_exists = os.path.isfile(filename)
-    with open(filename, 'a', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(tick_data)
+try:
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    from json import loads as json_loads, dumps as json_dumps
+
+# libyaml-backed loader when available, it parses roughly an order of magnitude faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Shared HTTPS session so token and account lookups reuse the same TLS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
 
 # Load credentials from creds.yaml
 with open('/content/drive/MyDrive/Colab Notebooks/config/dnse_creds.yaml') as f:
 # with open('creds.yaml') as f:
-    creds = yaml.safe_load(f)
+    creds = yaml.load(f, Loader=_YamlLoader)
     username = creds['usr']
     password = creds['pwd']
 
 def dnse_auth(username, password):
     url = "https://services.entrade.com.vn/dnse-user-service/api/auth"
-    payload = json.dumps({"username": username, "password": password})
-    headers = {'Content-Type': 'application/json'}
-    response = requests.request("POST", url, headers=headers, data=payload)
+    payload = json_dumps({"username": username, "password": password})
+    response = _SESSION.request("POST", url, headers=_JSON_HEADERS, data=payload)
     if response.status_code == 200:
-        token = response.json()['token']
+        token = json_loads(response.content)['token']
         return token
 
 def account_info(jwt_token):
     url = "https://services.entrade.com.vn/dnse-user-service/api/me"
     headers = {
-        'Content-Type': 'application/json',
+        **_JSON_HEADERS,
         'authorization': f'Bearer {jwt_token}'
     }
-    response = requests.request("GET", url, headers=headers)
+    response = _SESSION.request("GET", url, headers=headers)
     if response.status_code == 200:
-        return response.json()
+        return json_loads(response.content)
 
 jwt_token = dnse_auth(username, password)
 investor_id = account_info(jwt_token)['investorId']
@@ -58,12 +65,15 @@ class Config:
     BROKER = 'datafeed-lts.dnse.com.vn'
     PORT = 443
     TOPICS = ("plaintext/quotes/derivative/OHLC/1/VN30F1M", "plaintext/quotes/stock/tick/+")
+    # QoS 2 costs a four-packet handshake per message; QoS 0/1 raise receive throughput on busy wildcard topics
+    QOS = 2
     CLIENT_ID = f'python-json-mqtt-{random.randint(0, 1000)}'
     USERNAME = investor_id
     PASSWORD = jwt_token
 
 class MQTTClient:
-    def __init__(self):
+    def __init__(self, filename='tick_data.csv'):
+        self.tick_writer = open_tick_writer(filename)
         self.client = mqtt_client.Client(mqtt_client.CallbackAPIVersion.VERSION1,
                                          Config.CLIENT_ID,
                                          protocol=MQTTv5,
@@ -74,6 +84,12 @@ class MQTTClient:
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
         self.client.on_disconnect = self.on_disconnect
+        self.subscriptions = [(topic, SubscribeOptions(qos=Config.QOS)) for topic in Config.TOPICS]
+        self.FLAG_EXIT = False
+
+        self.tick_queue = queue.Queue(maxsize=10000)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
 
     def connect_mqtt(self):
         self.client.connect(Config.BROKER, Config.PORT, keepalive=120)
@@ -82,41 +98,74 @@ class MQTTClient:
     def on_connect(self, client, userdata, flags, rc, properties=None):
         if rc == 0:
             logging.info("Connected to MQTT Broker!")
-            topic_tuple = [(topic, SubscribeOptions(qos=2)) for topic in Config.TOPICS]
-            self.client.subscribe(topic_tuple)
+            self.client.subscribe(self.subscriptions)
         else:
-            logging.error(f'Failed to connect, return code {rc}')
+            logging.error('Failed to connect, return code %s', rc)
 
     def on_disconnect(self, client, userdata, rc, properties=None):
         logging.info("Disconnected with result code: %s", rc)
 
-    # def on_message(self, client, userdata, msg):
-    #     payload = json.loads(msg.payload.decode())
-    #     logging.debug(f"Received tick data: {payload}")
-    #     append_tick_to_csv(payload)
+    def _writer_loop(self):
+        """
+        Drain the tick queue in batches on a dedicated thread so disk writes never block the network loop.
+        """
+        while True:
+            try:
+                tick = self.tick_queue.get(timeout=self.tick_writer.flush_interval)
+            except queue.Empty:
+                self.tick_writer.flush()
+                continue
+            batch = [tick]
+            try:
+                while len(batch) < self.tick_writer.batch_size:
+                    batch.append(self.tick_queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = None in batch
+            if stop:
+                batch = batch[:batch.index(None)]
+            if batch:
+                # A bad batch is logged and skipped so it cannot stop the writer thread
+                try:
+                    for tick in _validate_ticks(batch):
+                        self.tick_writer.write(tick)
+                except Exception:
+                    logging.exception("Failed to write a batch of %d tick(s).", len(batch))
+            if stop:
+                self.tick_writer.close()
+                return
+
+    def close(self):
+        """
+        Stop the writer thread after the queued ticks are written and close the output file.
+        """
+        self.tick_queue.put(None)
+        self._writer_thread.join()
 
     def on_message(self, client, userdata, msg):
-        payload = json.loads(msg.payload.decode())
-        
-        # Perform cleaning and validation on payload here
-        # Example: Validate matchPrice and matchQtty exist and are numbers
-        
-        if 'matchPrice' in payload and 'matchQtty' in payload:
+        payload = json_loads(msg.payload)
+        tick = _process_tick(payload)
+        if tick is not None:
+            # Hand the tick over to the writer thread, dropping it if the writer falls too far behind
             try:
-                payload['matchPrice'] = float(payload['matchPrice'])
-                payload['matchQtty'] = float(payload['matchQtty'])
-                # Proceed to append data to CSV or directly to database
-                append_tick_to_csv(payload)
-                logging.debug(f"Received tick data: {payload}")
-            except ValueError:
-                logging.error("Invalid data format, skipping tick.")
+                self.tick_queue.put_nowait(tick)
+            except queue.Full:
+                logging.warning("Tick queue is full, dropping tick.")
+                return
+            logging.debug("Received tick data: %s", tick)
 
 
 def run():
     logging.basicConfig(format='%(asctime)s - %(levelname)s: %(message)s', level=logging.DEBUG)
     mqtt_client = MQTTClient()
     client = mqtt_client.connect_mqtt()
-    client.loop_forever()
+    client.loop_start()
+    try:
+        while not mqtt_client.FLAG_EXIT:
+            time.sleep(1)
+    finally:
+        client.loop_stop()
+        mqtt_client.close()
 
 if __name__ == '__main__':
     run()
\ No newline at end of file
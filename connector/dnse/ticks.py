@@ -0,0 +1,182 @@
+"""
+Shared tick handling for the DNSE MQTT clients: projecting payloads onto Tick records, batch validation and the CSV/Arrow writers.
+NumPy is imported on the first validated batch and pyarrow only when an Arrow writer is opened.
+"""
+
+import os
+import csv
+import time
+import atexit
+import logging
+import operator
+import itertools
+import collections
+
+FIELDNAMES = ('symbol', 'matchPrice', 'matchQtty', 'time', 'side', 'session', 'low', 'open', 'lastUpdated', 'volume', 'close', 'type', 'high')
+# Project a tick dict onto FIELDNAMES order in a single C-level call
+_TICK_ROW = operator.itemgetter(*FIELDNAMES)
+# Compact fixed-layout record queued for the writers instead of the full decoded payload dict
+Tick = collections.namedtuple('Tick', FIELDNAMES, defaults=(None,) * len(FIELDNAMES))
+# Arrow column types for the numeric tick fields, every other field is stored as string
+_ARROW_FLOAT_FIELDS = frozenset(('matchPrice', 'matchQtty', 'low', 'open', 'volume', 'close', 'high'))
+# Positions of the optional numeric fields, coerced per batch alongside matchPrice/matchQtty
+_OPTIONAL_FLOAT_INDEXES = tuple(i for i, field in enumerate(FIELDNAMES) if field in _ARROW_FLOAT_FIELDS and field not in ('matchPrice', 'matchQtty'))
+
+
+def _process_tick(payload):
+    """
+    Check matchPrice and matchQtty exist and project the payload onto a Tick. Return None for non-tick messages.
+    Numeric coercion and validation happen per batch in _validate_ticks.
+    """
+    if payload.get('matchPrice') is None or payload.get('matchQtty') is None:
+        return None
+    try:
+        return Tick._make(_TICK_ROW(payload))
+    except KeyError:
+        return Tick._make(_TICK_ROW({**Tick._field_defaults, **payload}))
+
+
+def _to_float_array(values):
+    """
+    Convert a sequence to float64 in one pass, turning unparsable entries into NaN.
+    """
+    import numpy as np
+
+    try:
+        return np.fromiter(values, dtype=np.float64, count=len(values))
+    except (ValueError, TypeError):
+        return np.array([_safe_float(value) for value in values], dtype=np.float64)
+
+
+def _safe_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+
+def _validate_ticks(ticks):
+    """
+    Coerce matchPrice/matchQtty of a batch to float and keep only ticks with a finite price and a positive quantity.
+    The other numeric fields are coerced too, with missing or unparsable values stored as None.
+    """
+    import numpy as np
+
+    prices = _to_float_array([tick.matchPrice for tick in ticks])
+    qtys = _to_float_array([tick.matchQtty for tick in ticks])
+    mask = np.isfinite(prices) & np.isfinite(qtys) & (qtys > 0)
+    dropped = len(ticks) - int(mask.sum())
+    if dropped:
+        logging.error("Invalid data format, skipping %d tick(s).", dropped)
+    rows = [[tick[0], price, qty, *tick[3:]]
+            for tick, price, qty in zip(itertools.compress(ticks, mask), prices[mask].tolist(), qtys[mask].tolist())]
+    for i in _OPTIONAL_FLOAT_INDEXES:
+        values = _to_float_array([row[i] for row in rows]).tolist()
+        for row, value in zip(rows, values):
+            # NaN is the only value not equal to itself
+            row[i] = None if value != value else value
+    return [Tick._make(row) for row in rows]
+
+
+class TickBatchWriter:
+    """
+    Ghi dữ liệu tick (Tick) vào file CSV theo lô, giữ file luôn mở trong suốt phiên kết nối.
+
+    Tham số:
+        - filename (str): Đường dẫn file CSV. Mặc định là 'tick_data.csv'.
+        - batch_size (int): Số bản ghi tối đa giữ trong bộ đệm trước khi ghi xuống file. Mặc định là 100.
+        - flush_interval (float): Thời gian tối đa (giây) giữa hai lần ghi xuống file. Mặc định là 0.2.
+    """
+    def __init__(self, filename='tick_data.csv', batch_size=100, flush_interval=0.2):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        file_exists = os.path.isfile(filename)
+        self.csvfile = open(filename, 'a', newline='')
+        self.writer = csv.writer(self.csvfile)
+        if not file_exists:
+            self.writer.writerow(FIELDNAMES)
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+
+    def write(self, tick):
+        self.buffer.append(tick)
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.writerows(self.buffer)
+            self.buffer = []
+        self.csvfile.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self.csvfile.closed:
+            self.flush()
+            self.csvfile.close()
+
+
+class TickArrowWriter:
+    """
+    Ghi dữ liệu tick vào file Arrow IPC stream theo từng lô dạng cột, tránh chi phí chuyển số thực sang chuỗi của CSV.
+    Yêu cầu cài đặt pyarrow. Nếu file đã tồn tại, dữ liệu phiên mới được ghi vào file có thêm hậu tố thời gian.
+
+    Tham số:
+        - filename (str): Đường dẫn file Arrow. Mặc định là 'tick_data.arrow'.
+        - batch_size (int): Số bản ghi tối đa trong mỗi record batch. Mặc định là 1000.
+        - flush_interval (float): Thời gian tối đa (giây) giữa hai lần ghi xuống file. Mặc định là 1.0.
+    """
+    def __init__(self, filename='tick_data.arrow', batch_size=1000, flush_interval=1.0):
+        import pyarrow as pa
+
+        if os.path.isfile(filename):
+            root, ext = os.path.splitext(filename)
+            filename = f"{root}-{time.strftime('%Y%m%d-%H%M%S')}{ext}"
+        self._pa = pa
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.schema = pa.schema([(field, pa.float64() if field in _ARROW_FLOAT_FIELDS else pa.string()) for field in FIELDNAMES])
+        self._sink = pa.OSFile(filename, 'wb')
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+        self._closed = False
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+
+    def write(self, tick):
+        self.buffer.append(tick)
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            # Take the buffer first so a batch that fails to convert is not retried on every flush
+            buffer, self.buffer = self.buffer, []
+            pa = self._pa
+            arrays = []
+            for field, column in zip(FIELDNAMES, zip(*buffer)):
+                if field in _ARROW_FLOAT_FIELDS:
+                    arrays.append(pa.array(column, type=pa.float64(), from_pandas=True))
+                else:
+                    arrays.append(pa.array([None if value is None else str(value) for value in column], type=pa.string()))
+            self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._closed:
+            self.flush()
+            self._writer.close()
+            self._sink.close()
+            self._closed = True
+
+
+def open_tick_writer(filename='tick_data.csv'):
+    """
+    Chọn bộ ghi tick theo phần mở rộng của file: '.arrow' dùng TickArrowWriter, các trường hợp khác ghi CSV.
+    """
+    if filename.endswith('.arrow'):
+        return TickArrowWriter(filename)
+    return TickBatchWriter(filename)
@@ -1,4 +1,3 @@
-from pandas import json_normalize
 import pandas as pd
 import json
 import time
@@ -7,6 +6,34 @@ from ssi_fc_data import fc_md_client, model
 # from ssi_fc_data.fc_md_stream import MarketDataStream
 from ssi_fc_data.fc_md_client import MarketDataClient
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _OrjsonShim:
+    """
+    Drop-in for the `json` module used inside ssi_fc_data.fc_md_client: decode responses with orjson,
+    keep stdlib dumps so request bodies stay `str` as the client expects.
+    """
+    JSONDecodeError = json.JSONDecodeError
+
+    @staticmethod
+    def loads(s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    dumps = staticmethod(json.dumps)
+    load = staticmethod(json.load)
+    dump = staticmethod(json.dump)
+
+
+# Only this connector imports fc_md_client, so the patch does not leak into other modules' json usage
+if orjson is not None and getattr(fc_md_client, 'json', None) is json:
+    fc_md_client.json = _OrjsonShim
+
 class StockData:
     def __init__(self, client, config):
         self.client = client
@@ -44,7 +71,7 @@ class StockData:
         """
         req = model.securities_details(market, symbol, page, size)
         response = self.client.securities_details(self.config, req)['data']
-        df = json_normalize(response[0]['RepeatedInfo'])
+        df = pd.DataFrame.from_records(response[0]['RepeatedInfo'])
         df['ReportDate'] = response[0]['ReportDate']
         df = df.dropna(axis=1, how='all')
         return df
@@ -66,7 +93,7 @@ class StockData:
         """
         req = model.daily_ohlc(symbol, start, end, page, size, ascending)
         response = self.client.daily_ohlc(self.config, req)['data']
-        df = json_normalize(response)
+        df = pd.DataFrame.from_records(response)
         df = df.drop(columns=['Time'])
         return df
 
@@ -88,7 +115,7 @@ class StockData:
         """
         req = model.intraday_ohlc(symbol, start, end, page, size, ascending, resolution)
         response = self.client.intraday_ohlc(self.config, req)
-        return json_normalize(response['data'])
+        return pd.DataFrame.from_records(response['data'])
 
     def daily_price(self, symbol='SSI', start='25/07/2023', end='31/07/2023', page=1, size=1000, market='') -> pd.DataFrame:
         """
@@ -107,7 +134,7 @@ class StockData:
         """
         req = model.daily_stock_price(symbol, start, end, page, size, market)
         response = self.client.daily_stock_price(self.config, req)['data']
-        return json_normalize(response)
+        return pd.DataFrame.from_records(response)
 
 class IndexData:
     def __init__(self, client, config):
@@ -126,7 +153,7 @@ class IndexData:
         """
         req = model.index_list(exchange, page, size)
         response = self.client.index_list(self.config, req)['data']
-        return json_normalize(response)
+        return pd.DataFrame.from_records(response)
 
     def component(self, index='VN30', page=1, size=100) -> pd.DataFrame:
         """
@@ -146,7 +173,7 @@ class IndexData:
         exchange = response['Exchange']
         total = response['TotalSymbolNo']
         print(f'Chỉ số: {code} - {exchange}. Tổng số {total} mã chứng khoán')
-        df = json_normalize(response['IndexComponent'])
+        df = pd.DataFrame.from_records(response['IndexComponent'])
         df = df.drop(columns=['Isin'])
         return df
 
@@ -169,7 +196,7 @@ class IndexData:
         """
         req = model.daily_index(request_id, index, start, end, page, size, orderBy, order)
         response = self.client.daily_index(self.config, req)['data']
-        df = json_normalize(response)
+        df = pd.DataFrame.from_records(response)
         df = df.dropna(axis=1, how='all')
         return df
 
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from vnstock.core.utils.logger import get_logger
+from vnstock_data.core.utils.const import PROJECT_DIR
+from vnstock_data.core.utils.parser import json_loads
+
+logger = get_logger(__name__)
+
+CACHE_DIR = PROJECT_DIR / 'cache'
+
+class FileCache:
+    """
+    Small on-disk cache for decoded JSON API responses, fronted by an in-process memory layer.
+    Entries are stored one file per key (hashed with blake2b) under a namespace folder, each with the expiry decided when it was written.
+    Cached values are shared between callers and must be treated as read-only.
+    The memory layer keeps only the most recently used entries; older ones are still served from disk.
+    """
+
+    def __init__(self, namespace: str, ttl: float = 3600, cache_dir: Path = CACHE_DIR, max_memory_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Parameters:
+            namespace (str): Sub-folder name, usually the data source.
+            ttl (float): Default entry lifetime in seconds. Default is 3600.
+            cache_dir (Path): Root cache folder. Default is ~/.vnstock/cache.
+            max_memory_entries (int): Number of entries kept in memory. Default is 256.
+        """
+        self.directory = Path(cache_dir) / namespace
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self._memory: 'OrderedDict[str, Tuple[Optional[float], Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    @staticmethod
+    def _expired(expires: Optional[float], now: float) -> bool:
+        # None marks an entry that never expires
+        return expires is not None and now > expires
+
+    def _remember(self, key: str, expires: Optional[float], value: Any) -> None:
+        # Caller holds the lock; evict least recently used entries beyond the bound
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None when missing, expired or unreadable.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    logger.debug(f'Cache hit (memory): {key}')
+                    return entry[1]
+                del self._memory[key]
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = json_loads(f.read())
+        except (OSError, ValueError):
+            logger.debug(f'Cache miss: {key}')
+            return None
+        # Files written before expiries were recorded, or hash collisions, count as misses
+        if not isinstance(entry, dict) or entry.get('key') != key or 'expires' not in entry:
+            logger.debug(f'Cache miss: {key}')
+            return None
+        if self._expired(entry['expires'], now):
+            logger.debug(f'Cache expired: {key}')
+            return None
+        with self._lock:
+            self._remember(key, entry['expires'], entry['value'])
+        logger.debug(f'Cache hit (disk): {key}')
+        return entry['value']
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` for `key`. Failures to write are ignored so caching never breaks a request.
+        `ttl` overrides the instance lifetime for this entry; pass float('inf') for data that can no longer change.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl == float('inf') else time.time() + ttl
+        with self._lock:
+            self._remember(key, expires, value)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'expires': expires, 'value': value}, f)
+            # Atomic swap so concurrent readers never see a half-written file
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def invalidate(self, prefix: str = '') -> int:
+        """
+        Drop every entry whose key starts with `prefix`; an empty prefix clears the whole namespace.
+
+        Returns:
+            int: Number of files removed from disk.
+        """
+        with self._lock:
+            for key in [key for key in self._memory if key.startswith(prefix)]:
+                del self._memory[key]
+        removed = 0
+        try:
+            paths = list(self.directory.glob('*.json'))
+        except OSError:
+            return removed
+        for path in paths:
+            try:
+                if prefix:
+                    with open(path, 'rb') as f:
+                        entry = json_loads(f.read())
+                    if not isinstance(entry, dict) or not str(entry.get('key', '')).startswith(prefix):
+                        continue
+                path.unlink()
+                removed += 1
+            except (OSError, ValueError):
+                continue
+        logger.debug(f'Cache invalidated {removed} entries with prefix {prefix!r} in {self.directory}')
+        return removed
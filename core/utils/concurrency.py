@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Hashable
+
+def run_concurrently(tasks: Dict[Hashable, Callable[[], Any]], max_workers: int = 16) -> Dict[Hashable, Any]:
+    """
+    Run independent I/O-bound callables on a thread pool and collect their results by key.
+
+    Parameters:
+        tasks (dict): Mapping of key to a zero-argument callable.
+        max_workers (int): Maximum number of worker threads. Default is 16.
+
+    Returns:
+        dict: Mapping of key to the callable's return value, in the same key order as `tasks`.
+
+    Raises:
+        Exception: Re-raises the first exception raised by any task.
+    """
+    if not tasks:
+        return {}
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = {executor.submit(func): key for key, func in tasks.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return {key: results[key] for key in tasks}
@@ -1,93 +1,115 @@
 import os
+import re
 import sys
 import json
+import functools
 import importlib.metadata
 from ..const import PACKAGE_MAPPING
 from vnii import lc_init
 from vnstock_data.core.utils.const import PROJECT_DIR, ID_DIR
 
+try:
+    from IPython import get_ipython
+except ImportError:
+    get_ipython = None
+
+def _normalize_name(name):
+    "Normalize a distribution name the same way importlib.metadata does when looking it up."
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+@functools.lru_cache(maxsize=1)
+def _installed_versions():
+    "Scan installed distributions once and map their normalized names to versions."
+    versions = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            versions.setdefault(_normalize_name(name), dist.version)
+    return versions
+
+
 def get_packages_info(package_mapping=PACKAGE_MAPPING):
     "Get installed packages and their versions to customize experience."
+    versions = _installed_versions()
     installed_packages = {}
     for category, packages in package_mapping.items():
         installed_packages[category] = []
         for pkg in packages:
-            try:
-                version = importlib.metadata.version(pkg)
+            version = versions.get(_normalize_name(pkg))
+            if version is not None:
                 installed_packages[category].append(pkg + ' ' + version)
-            except importlib.metadata.PackageNotFoundError:
-                pass
     return installed_packages
 
 
+_HOSTING_ENV_MARKERS = (
+    # (environment variable, required substring in its value, hosting name)
+    ('CODESPACE_NAME', None, "Github Codespace"),
+    ('GITPOD_WORKSPACE_CLUSTER_HOST', None, "Gitpod"),
+    ('REPLIT_USER', None, "Replit"),
+    ('KAGGLE_CONTAINER_NAME', None, "Kaggle"),
+    ('SPACE_HOST', '.hf.space', "Hugging Face Spaces"),
+)
+
+
 class SystemInfo:
     """
     Gathers information about the interface and system.
+
+    The environment does not change during a session, so every check is evaluated once and shared by all instances.
     """
     def __init__(self):
         pass
 
-    def _is_jpylab(self):
-        try:
-            shell = get_ipython().__class__.__name__
-            if shell == 'ZMQInteractiveShell':
-                if 'JPY_PARENT_PID' in os.environ or 'JPY_USER' in os.environ:
-                    return True
-            return False
-        except NameError:
-            return False
-
-    def interface(self):
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _is_jpylab():
+        shell = get_ipython is not None and get_ipython()
+        if shell.__class__.__name__ == 'ZMQInteractiveShell':
+            if 'JPY_PARENT_PID' in os.environ or 'JPY_USER' in os.environ:
+                return True
+        return False
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def interface():
         """
         Determines the current interface (e.g., Terminal, Jupyter, Other).
 
         Returns:
             str: A string representing the current interface.
         """
-        try:
-            from IPython import get_ipython
-            if 'IPKernelApp' not in get_ipython().config:  # Check if not in IPython kernel
-                if sys.stdout.isatty():
-                    return "Terminal"
-                else:
-                    return "Other"  # Non-interactive interface (e.g., script executed from an IDE)
-            else:
-                return "Jupyter"
-        except (ImportError, AttributeError):
-            # Fallback if IPython isn't installed or other checks fail
-            if sys.stdout.isatty():
-                return "Terminal"
-            else:
-                return "Other"
+        shell = get_ipython is not None and get_ipython()
+        if shell and 'IPKernelApp' in getattr(shell, 'config', {}):
+            return "Jupyter"
+        # Not in an IPython kernel, or IPython isn't installed
+        if sys.stdout.isatty():
+            return "Terminal"
+        else:
+            return "Other"  # Non-interactive interface (e.g., script executed from an IDE)
 
-    def hosting(self):
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def hosting():
         """
         Determines the hosting service if running in a cloud or special environment.
 
         Returns:
             str: A string representing the hosting service (e.g., Google Colab, Github Codespace, etc.).
         """
-        try:
-            if 'google.colab' in sys.modules:
-                return "Google Colab"
-            if self._is_jpylab():
-                return "JupyterLab"
-            elif 'CODESPACE_NAME' in os.environ:
-                return "Github Codespace"
-            elif 'GITPOD_WORKSPACE_CLUSTER_HOST' in os.environ:
-                return "Gitpod"
-            elif 'REPLIT_USER' in os.environ:
-                return "Replit"
-            elif 'KAGGLE_CONTAINER_NAME' in os.environ:
-                return "Kaggle"
-            elif 'SPACE_HOST' in os.environ and '.hf.space' in os.environ['SPACE_HOST']:
-                return "Hugging Face Spaces"
-            else:
-                return "Local or Unknown"
-        except KeyError:
-            return "Local or Unknown"
+        if 'google.colab' in sys.modules:
+            return "Google Colab"
+        if SystemInfo._is_jpylab():
+            return "JupyterLab"
+        for key, marker, name in _HOSTING_ENV_MARKERS:
+            value = os.environ.get(key)
+            if value is not None and (marker is None or marker in value):
+                return name
+        return "Local or Unknown"
 
-    def os(self):
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def os():
         """
         Determines the operating system.
 
@@ -2,13 +2,15 @@ import requests
 import pandas as pd
 from typing import Dict, Any
 from vnstock_data.core.const import ERROR_MESSAGES
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.parser import json_loads
 
 class Fetcher:
     """
     Common request fetcher for all data providers, ready to be extended for specific requirements.
     """
 
-    def __init__(self, base_url: str, headers: Dict[str, str], api_key: str = None):
+    def __init__(self, base_url: str, headers: Dict[str, str], api_key: str = None, timeout: float = 30):
         """
         Initialize the Fetcher with a base URL and headers.
 
@@ -16,10 +18,26 @@ class Fetcher:
             base_url (str): Base URL for the API.
             headers (dict): Default headers for the API requests.
             api_key (str, optional): API key for authentication. Default is None.
+            timeout (float, optional): Request timeout in seconds. Default is 30.
         """
         self.base_url = base_url
         self.headers = headers
         self.api_key = api_key
+        self.timeout = timeout
+        # Pooled session keeps the TCP/TLS connection to the provider open across fetch calls
+        self._session = build_session(headers)
+
+    def close(self):
+        """
+        Release the pooled connections held by the underlying session.
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def fetch(self, endpoint: str, params: Dict[str, Any], extra_headers: Dict[str, str] = None) -> Dict[str, Any]:
         """
@@ -38,12 +56,9 @@ class Fetcher:
             ValueError: If the response status code is not 200 or the data is empty.
         """
         url = f"{self.base_url}{endpoint}"
-        merged_headers = self.headers.copy()
-        if extra_headers:
-            merged_headers.update(extra_headers)
 
         try:
-            response = requests.get(url, headers=merged_headers, params=params)
+            response = self._session.get(url, headers=extra_headers or None, params=params, timeout=self.timeout)
             response.raise_for_status()
         except requests.RequestException as err:
             raise RuntimeError(f"{ERROR_MESSAGES['api_failure']}: {err}")
@@ -51,7 +66,7 @@ class Fetcher:
         if response.status_code != 200:
             raise ValueError("No available data: Non-200 status code received.")
 
-        response_data = response.json()
+        response_data = json_loads(response.content)
 
         # Check if the data is empty using generic length check
         if not self._has_data(response_data):
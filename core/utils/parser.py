@@ -1,6 +1,25 @@
+import re
 import urllib.parse
+import functools
 import pandas as pd
-from datetime import datetime, timedelta
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from vnstock.core.utils.parser import camel_to_snake as _camel_to_snake, get_asset_type as _get_asset_type
+
+try:
+    import orjson as _orjson
+    from orjson import loads as _json_loads, dumps as _json_dumps
+except ImportError:
+    _orjson = None
+    from json import loads as _json_loads, dumps as _json_dumps
+
+# Lookback period such as '5D', '3M' or '1Y' and the approximate day count of each unit
+_PERIOD_RE = re.compile(r'^(\d+)([DMYdmy])$')
+_UNIT_DAYS = {'D': 1, 'M': 30, 'Y': 365}
+
+# Vietnam market time and the end of the trading day, after the closing auction and put-through window
+_VN_TZ = timezone(timedelta(hours=7))
+_SESSION_CLOSE = time(15, 0)
 
 def encode_url(string:str, safe:str=''):
     """
@@ -8,6 +27,102 @@ def encode_url(string:str, safe:str=''):
     """
     return urllib.parse.quote(string, safe=safe)
 
+def json_loads(data):
+    """
+    Decode JSON from bytes or str, using orjson when it is installed and the stdlib json otherwise.
+    """
+    return _json_loads(data)
+
+def json_dumps(obj):
+    """
+    Encode an object to JSON for a request body: bytes from orjson when it is installed, str from the stdlib json otherwise.
+    """
+    return _json_dumps(obj)
+
+def _json_default(obj):
+    # Match DataFrame.to_json: timestamps as epoch milliseconds, NaT as null
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, datetime):
+        return pd.Timestamp(obj).value // 1_000_000
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def df_to_json(df: pd.DataFrame) -> str:
+    """
+    Serialize a DataFrame to a JSON array of records, like df.to_json(orient='records').
+    Uses orjson when it is installed, which is considerably faster on large frames.
+    """
+    if _orjson is None:
+        return df.to_json(orient='records')
+    records = df.to_dict(orient='records')
+    return _orjson.dumps(records, default=_json_default,
+                         option=_orjson.OPT_SERIALIZE_NUMPY | _orjson.OPT_PASSTHROUGH_DATETIME).decode('utf-8')
+
+@functools.lru_cache(maxsize=4096)
+def camel_to_snake(name: str) -> str:
+    """
+    Memoized vnstock camel_to_snake; API column names repeat on every call, so each is converted only once.
+    """
+    return _camel_to_snake(name)
+
+@functools.lru_cache(maxsize=4096)
+def get_asset_type(symbol: str) -> str:
+    """
+    Memoized vnstock get_asset_type; scanning a universe builds many objects for the same symbols.
+    """
+    return _get_asset_type(symbol)
+
+@functools.lru_cache(maxsize=1)
+def _pyarrow():
+    """
+    Import pyarrow on first use, or return None when it is not installed.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+def _arrow_records_to_df(pa, records: list) -> Optional[pd.DataFrame]:
+    """
+    Build the frame through Arrow's columnar builder, or return None when Arrow cannot match the pandas result.
+    """
+    try:
+        # Inferring a struct type scans every record, so the schema holds the union of their keys
+        struct = pa.array(records)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        # Mixed value types in a field; pandas infers an object column instead
+        return None
+    if not pa.types.is_struct(struct.type):
+        return None
+    # Nested fields would come back as numpy arrays or dicts of arrays instead of the original objects
+    if any(pa.types.is_nested(field.type) for field in struct.type):
+        return None
+    return pa.RecordBatch.from_struct_array(struct).to_pandas()
+
+def records_to_df(records: list, exclude: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Build a DataFrame from a list of JSON records.
+    Columns are the union of the keys of all records, so fields absent from the first rows are kept.
+    Uses pyarrow's columnar builder for flat records when it is installed, which is much faster on wide payloads,
+    and pandas otherwise; both give the same numpy-backed dtypes.
+
+    Parameters:
+        records (list): List of dicts, one per row.
+        exclude (list, optional): Columns to leave out if present. Default is None.
+
+    Returns:
+        pd.DataFrame: The resulting DataFrame.
+    """
+    pa = _pyarrow()
+    df = _arrow_records_to_df(pa, records) if pa is not None and records else None
+    if df is None:
+        df = pd.DataFrame.from_records(records)
+    if exclude:
+        # Excluded fields may be absent from a given payload
+        df = df.drop(columns=exclude, errors='ignore')
+    return df
+
 def days_between (start: str, end: str, format: str = '%m/%d/%Y') -> int:
     """
     Calculate the number of days between two given datestrings.
@@ -20,11 +135,37 @@ def days_between (start: str, end: str, format: str = '%m/%d/%Y') -> int:
     Returns:
         int: The number of days between the two dates.
     """
-    start = pd.to_datetime(start, format=format)
-    end = pd.to_datetime(end, format=format)
+    start = _parse_cached(start, format)
+    end = _parse_cached(end, format)
     days = (end - start).days
     return days
 
+@functools.lru_cache(maxsize=4096)
+def _parse_cached(date_str: str, format: str) -> pd.Timestamp:
+    """
+    Memoized pd.to_datetime for date strings; batch scans reuse the same few dates across many symbols.
+    """
+    return pd.to_datetime(date_str, format=format)
+
+@functools.lru_cache(maxsize=4096)
+def to_mdy(date_str: str) -> str:
+    """
+    Convert a 'YYYY-mm-dd' date string to 'mm/dd/YYYY' format, memoized.
+
+    Parameters:
+        date_str (str): The date string to convert, in 'YYYY-mm-dd' format.
+
+    Returns:
+        str: The date in '%m/%d/%Y' format.
+    """
+    return pd.to_datetime(date_str, format='%Y-%m-%d').strftime('%m/%d/%Y')
+
+
+def session_closed(day: date) -> bool:
+    """
+    Return True once the trading session of `day` has closed in Vietnam time, after which its data no longer changes.
+    """
+    return datetime.now(_VN_TZ).replace(tzinfo=None) >= datetime.combine(day, _SESSION_CLOSE)
 
 def lookback_date(period: str) -> str:
     """
@@ -40,17 +181,8 @@ def lookback_date(period: str) -> str:
     Raises:
         ValueError: If the period format is invalid.
     """
-    try:
-        unit = period[-1].upper()
-        value = int(period[:-1])
-        if unit == 'D':
-            start_date = datetime.now() - timedelta(days=value)
-        elif unit == 'M':
-            start_date = datetime.now() - timedelta(days=value * 30)
-        elif unit == 'Y':
-            start_date = datetime.now() - timedelta(days=value * 365)
-        else:
-            raise ValueError("Invalid period format. Use 'D', 'M', or 'Y' for days, months, or years.")
-        return start_date.strftime('%Y-%m-%d')
-    except Exception as e:
-        raise ValueError(f"Error parsing period: {e}")
+    match = _PERIOD_RE.match(period) if isinstance(period, str) else None
+    if match is None:
+        raise ValueError("Error parsing period: Invalid period format. Use 'D', 'M', or 'Y' for days, months, or years.")
+    days = int(match.group(1)) * _UNIT_DAYS[match.group(2).upper()]
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
@@ -0,0 +1,64 @@
+import random
+import requests
+from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class JitteredRetry(Retry):
+    """
+    Retry policy with capped exponential backoff plus random jitter, so throttled clients do not retry in lockstep.
+    Retry-After headers on 429/503 responses are honoured by urllib3 before this backoff applies.
+    """
+    BACKOFF_CAP = 60
+    BACKOFF_JITTER = 0.5
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return min(self.BACKOFF_CAP, backoff) + random.uniform(0, self.BACKOFF_JITTER)
+
+def build_retry(total: int = 5, backoff_factor: float = 0.5) -> Retry:
+    """
+    Build the default retry policy for idempotent GET requests on rate-limit and transient server errors.
+
+    Parameters:
+        total (int): Maximum number of retries. Default is 5.
+        backoff_factor (float): Base delay in seconds for the exponential backoff. Default is 0.5.
+
+    Returns:
+        Retry: The configured retry policy.
+    """
+    return JitteredRetry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+def build_session(headers: Optional[Dict[str, str]] = None, pool_connections: int = 10, pool_maxsize: int = 20, max_retries: int = 5) -> requests.Session:
+    """
+    Create a requests Session with a pooled HTTPAdapter mounted for both http and https,
+    so repeated calls to the same host reuse open TCP/TLS connections.
+
+    Parameters:
+        headers (dict, optional): Default headers sent with every request. Default is None.
+        pool_connections (int): Number of host pools to cache. Default is 10.
+        pool_maxsize (int): Maximum connections kept open per host. Default is 20.
+        max_retries (int): Retries on 429/5xx for GET requests, with jittered backoff. Set to 0 to disable. Default is 5.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    retry = build_retry(total=max_retries) if max_retries else 0
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -1,4 +1,7 @@
+import functools
 from fake_useragent import UserAgent
+# Every content encoding urllib3 can decode with the installed packages, including br/zstd when available
+from urllib3.util.request import ACCEPT_ENCODING
 from vnstock.core.utils.user_agent import HEADERS_MAPPING_SOURCE, DEFAULT_HEADERS
 
 VDS_HEADERS = {
@@ -22,20 +25,25 @@ HEADERS_MAPPING_SOURCE['FIINTRADE'] = {'Referer': 'https://fiintrade.vn', 'Origi
 HEADERS_MAPPING_SOURCE['FIDT'] = {'Referer': 'https://portal.fidt.vn', 'Origin': 'https://portal.fidt.vn/'}
 HEADERS_MAPPING_SOURCE['CAFEF'] = {'Referer': 'https://s.cafef.vn/lich-su-giao-dich-vnindex-3.chn', 'Origin': 'https://s.cafef.vn/lich-su-giao-dich-vnindex-3.chn'}
 
+@functools.lru_cache(maxsize=1)
+def _get_ua() -> UserAgent:
+    """
+    Build the UserAgent once; constructing it loads and parses the bundled browser database.
+    """
+    return UserAgent(fallback='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36')
+
+def _base_headers(data_source):
+    headers = {**(VDS_HEADERS if data_source == 'VDS' else DEFAULT_HEADERS), 'Accept-Encoding': ACCEPT_ENCODING}
+    headers.update(HEADERS_MAPPING_SOURCE.get(data_source, {}))
+    return headers
+
+# Source-specific headers merged once at import; get_headers only adds the User-Agent on top
+_PREMERGED = {source: _base_headers(source) for source in HEADERS_MAPPING_SOURCE}
+
 def get_headers(data_source='SSI', random_agent=True):
     """
     Tạo headers cho request theo nguồn dữ liệu.
     """
     data_source = data_source.upper()
-    ua = UserAgent(fallback='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36')
-    if data_source == 'VDS':
-        headers = VDS_HEADERS
-    else:
-        headers = DEFAULT_HEADERS.copy()
-        
-    if random_agent:
-        headers['User-Agent'] = ua.random
-    else:
-        headers['User-Agent'] = ua.chrome
-    headers.update(HEADERS_MAPPING_SOURCE.get(data_source, {}))
-    return headers
\ No newline at end of file
+    ua = _get_ua()
+    return {**(_PREMERGED.get(data_source) or _base_headers(data_source)), 'User-Agent': ua.random if random_agent else ua.chrome}
@@ -1,16 +1,28 @@
+import re
 from datetime import datetime
 from vnstock.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Same shape strptime accepts for '%Y-%m-%d': four-digit year, one or two digit month and day
+_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
 # define a function to validate date string format in the format YYYY-mm-dd
 def validate_date(date_str:str):
     """
     Validate date string format in the format YYYY-mm-dd.
     """
-    try:
-        datetime.strptime(date_str, '%Y-%m-%d')
-        return True
-    except ValueError:
-        logger.error(f"Invalid date format: {date_str}. Please use the format YYYY-mm-dd.")
-        return False
+    match = _DATE_RE.fullmatch(date_str) if isinstance(date_str, str) else None
+    if match is not None:
+        month, day = int(match.group(2)), int(match.group(3))
+        if 1 <= month <= 12 and 1 <= day <= 28:
+            return True
+        # Only month-end days need the calendar check
+        if 1 <= month <= 12 and day <= 31:
+            try:
+                datetime.strptime(date_str, '%Y-%m-%d')
+                return True
+            except ValueError:
+                pass
+    logger.error(f"Invalid date format: {date_str}. Please use the format YYYY-mm-dd.")
+    return False
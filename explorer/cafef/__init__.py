@@ -1 +1 @@
-from .trading import Trading
\ No newline at end of file
+from .trading import Trading, fetch_many
\ No newline at end of file
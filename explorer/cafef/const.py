@@ -70,4 +70,26 @@ _INSIDER_DEAL_MAP = {
     "TransactionNote": "transaction_note",
     "ShareHolderCode": "shareholder_code",
     "TyLeSoHuu": "ownership_percentage",
-}
\ No newline at end of file
+}
+
+# Fields requested from the raw API records and dtypes of their numeric columns, applied before renaming
+_PRICE_HISTORY_FIELDS = [col for col in _PRICE_HISTORY_MAP if col != 'change_pct']
+
+# Prices, values and ratios are float64; share and order counts stay int64 as pandas infers them
+_PRICE_HISTORY_DTYPES = {**dict.fromkeys(['GiaMoCua', 'GiaCaoNhat', 'GiaThapNhat', 'GiaDongCua', 'GiaDieuChinh',
+                                          'GiaTriKhopLenh', 'GtThoaThuan'], 'float64'),
+                         **dict.fromkeys(['KhoiLuongKhopLenh', 'KLThoaThuan'], 'int64')}
+
+_FOREIGN_TRADE_DTYPES = {**dict.fromkeys(['GTDGRong', 'GtMua', 'GtBan', 'DangSoHuu'], 'float64'),
+                         **dict.fromkeys(['KLGDRong', 'KLMua', 'KLBan', 'RoomConLai'], 'int64')}
+
+_PROP_TRADE_DTYPES = {**dict.fromkeys(['GtMua', 'GtBan'], 'float64'),
+                      **dict.fromkeys(['KLcpMua', 'KlcpBan'], 'int64')}
+
+_ORDER_STATS_DTYPES = {**dict.fromkeys(['KLTB1LenhMua', 'KLTB1LenhBan'], 'float64'),
+                       **dict.fromkeys(['SoLenhMua', 'SoLenhDatBan', 'KLDatMua', 'KLDatBan', 'ChenhLechKL'], 'int64')}
+
+_INSIDER_DEAL_DTYPES = {**dict.fromkeys(['TyLeSoHuu'], 'float64'),
+                        **dict.fromkeys(['VolumeBeforeTransaction', 'PlanBuyVolume', 'PlanSellVolume', 'RealBuyVolume',
+                                         'RealSellVolume', 'VolumeAfterTransaction'], 'int64')}
+
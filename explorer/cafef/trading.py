@@ -1,18 +1,115 @@
-import requests
+import re
 import pandas as pd
-from typing import Union, Optional, Dict
-from vnstock_data.explorer.cafef.const import _BASE_URL, _PRICE_HISTORY_MAP, _FOREIGN_TRADE_MAP, _PROP_TRADE_MAP, _ORDER_STATS_MAP, _INSIDER_DEAL_MAP
-from vnstock_data.core.utils.parser import days_between
+from functools import partial
+from typing import Union, Optional, Dict, List
+from vnstock_data.explorer.cafef.const import _BASE_URL, _PRICE_HISTORY_MAP, _FOREIGN_TRADE_MAP, _PROP_TRADE_MAP, _ORDER_STATS_MAP, _INSIDER_DEAL_MAP, \
+    _PRICE_HISTORY_FIELDS, _PRICE_HISTORY_DTYPES, _FOREIGN_TRADE_DTYPES, _PROP_TRADE_DTYPES, _ORDER_STATS_DTYPES, _INSIDER_DEAL_DTYPES
+from vnstock_data.core.utils.parser import days_between, to_mdy, json_loads
 from vnstock_data.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.cache import FileCache
+from vnstock_data.core.utils.concurrency import run_concurrently
 from vnstock.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Shared across Trading instances so per-symbol loops reuse the open connection to s.cafef.vn
+_SESSION = build_session(pool_maxsize=20)
+
+# Raw responses kept on disk for an hour so repeated (symbol, range, page) queries skip the round-trip
+_CACHE = FileCache('cafef', ttl=3600)
+
+# Percent part of CafeF's change string, e.g. '0.5(1.23 %)' -> '1.23'
+_CHANGE_PCT_RE = re.compile(r'\(\s*(-?[\d.,]+)\s*%?\s*\)')
+_MS_DATE_RE = re.compile(r'(-?\d+)')
+_INSIDER_DATE_COLUMNS = ["plan_begin_date", "plan_end_date", "real_end_date", "published_date", "order_date"]
+
+_SNAPSHOT_METHODS = ('price_history', 'foreign_trade', 'prop_trade', 'order_stats', 'insider_deal')
+
+# Output column order for each mapping, built once instead of on every _df_standardized call
+_SORTED_COLUMNS = {id(mapping): list(mapping.values()) for mapping in (_PRICE_HISTORY_MAP, _FOREIGN_TRADE_MAP, _PROP_TRADE_MAP, _ORDER_STATS_MAP, _INSIDER_DEAL_MAP)}
+
+def _records_to_df(records:List[Dict], columns:List[str], dtypes:Dict[str, str]) -> pd.DataFrame:
+    """
+    Build a DataFrame from API records keeping the known fields in order and applying their numeric dtypes.
+    Fields missing from the response are logged and left out rather than filled with NaN.
+    A column that cannot be converted (e.g. a count with nulls) keeps its inferred dtype.
+    """
+    df = pd.DataFrame.from_records(records)
+    present = [col for col in columns if col in df.columns]
+    if len(present) != len(columns):
+        logger.debug(f'Fields missing from API response: {[col for col in columns if col not in df.columns]}')
+    df = df.reindex(columns=present)
+    for col, dtype in dtypes.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        try:
+            values = df[col].astype('float64')
+            # Counts become int64 only when every value is a whole number, never by truncating
+            if dtype == 'int64' and not (values.notna().all() and (values % 1 == 0).all()):
+                raise ValueError('column has nulls or fractional values')
+            df[col] = values.astype(dtype)
+        except (ValueError, TypeError) as e:
+            logger.debug(f'Failed to apply predefined dtype to {col}: {e}')
+    return df
+
+def _is_cacheable(data:Dict) -> bool:
+    """
+    Return True for a successful CafeF response that carries records in Data.Data.
+    """
+    if not isinstance(data, dict) or data.get('Success') is False:
+        return False
+    payload = data.get('Data')
+    return isinstance(payload, dict) and bool(payload.get('Data'))
+
 class Trading:
-    def __init__(self, symbol:str, random_agent:bool=False):
+    def __init__(self, symbol:str, random_agent:bool=False, cache:bool=True):
         self.symbol = symbol.upper()
         self.base_url = _BASE_URL
         self.headers = get_headers(data_source='CAFEF', random_agent=random_agent)
+        self.cache = _CACHE if cache else None
+
+    def _get_json(self, url:str) -> Dict:
+        """
+        Gửi request tới CafeF và trả về dữ liệu JSON, ưu tiên đọc từ bộ nhớ đệm trên đĩa nếu còn hiệu lực.
+
+        Tham số:
+            - url (str): Đường dẫn request.
+        Return:
+            - Dict: Dữ liệu JSON đã giải mã.
+        """
+        if self.cache is not None:
+            data = self.cache.get(url)
+            if data is not None:
+                logger.debug(f'Cache hit: {url}')
+                return data
+        response = _SESSION.get(url, headers=self.headers)
+        if response.status_code != 200:
+            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.text}")
+        data = json_loads(response.content)
+        # Only cache successful, non-empty payloads so a transient error is not served for the next hour
+        if self.cache is not None and _is_cacheable(data):
+            self.cache.set(url, data)
+        return data
+
+    def _get_page(self, endpoint:str, start:str, end:str, page:int, limit:Optional[int]) -> Dict:
+        """
+        Tạo URL cho endpoint CafeF theo mã chứng khoán, khoảng thời gian và phân trang, sau đó trả về phần 'Data' của kết quả.
+
+        Tham số:
+            - endpoint (str): Tên endpoint, ví dụ 'PriceHistory.ashx'.
+            - start (str): Ngày bắt đầu, định dạng YYYY-mm-dd.
+            - end (str): Ngày kết thúc, định dạng YYYY-mm-dd.
+            - page (int): Trang hiện tại.
+            - limit (int): Số lượng dữ liệu trả về. Nếu là None, đặt bằng số ngày giữa start và end.
+        Return:
+            - Dict: Phần 'Data' của dữ liệu JSON.
+        """
+        if limit is None:
+            limit = days_between(start=start, end=end, format='%Y-%m-%d')
+        # convert start and end string to %m/%d/%Y format
+        url = f"{self.base_url}/{endpoint}?Symbol={self.symbol}&StartDate={to_mdy(start)}&EndDate={to_mdy(end)}&PageIndex={page}&PageSize={limit}"
+        return self._get_json(url)['Data']
 
     def _df_standardized (self, history_data:pd.DataFrame, mapping_dict:Dict) -> pd.DataFrame:
         """
@@ -23,17 +120,16 @@ class Trading:
         Return:
             - DataFrame: Dữ liệu lịch sử giá của mã chứng khoán.
         """
-        history_data = history_data.rename(columns=mapping_dict)
-        sorted_columns = mapping_dict.values()
-        if history_data.empty:
+        if len(history_data) == 0:
             logger.info('No data found')
             return None
         else:
-            try:
-                history_data = history_data[sorted_columns]
-            except:
-                logger.debug(f'Failed to sort column names. Actual columns and predefine mapping dict mismatched. Actual columns: {history_data.columns}. Expected columns: {sorted_columns}')
-                pass
+            history_data = history_data.rename(columns=mapping_dict)
+            sorted_columns = _SORTED_COLUMNS.get(id(mapping_dict)) or list(mapping_dict.values())
+            columns = [col for col in sorted_columns if col in history_data.columns]
+            if len(columns) != len(sorted_columns):
+                logger.debug(f'Actual columns and predefine mapping dict mismatched. Actual columns: {history_data.columns}. Expected columns: {sorted_columns}')
+            history_data = history_data[columns]
 
             # Set time index
             if 'time' in history_data.columns:
@@ -53,29 +149,20 @@ class Trading:
         Return:
             - DataFrame: Dữ liệu lịch sử giá của mã chứng khoán.
         """
-        if limit is None:
-            limit = days_between(start=start, end=end, format='%Y-%m-%d')
-        # convert start and end string to %m/%d/%Y format
-        start = pd.to_datetime(start).strftime('%m/%d/%Y')
-        end = pd.to_datetime(end).strftime('%m/%d/%Y')
-        url = f"{self.base_url}/PriceHistory.ashx?Symbol={self.symbol}&StartDate={start}&EndDate={end}&PageIndex={page}&PageSize={limit}"
-        response = requests.request("GET", url, headers=self.headers)
-        if response.status_code != 200:
-            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.text}")
-        data = response.json()['Data']
+        data = self._get_page('PriceHistory.ashx', start, end, page, limit)
         records = data['TotalCount']
         logger.info(f'Lịch sử giá:\nMã CK: {self.symbol}. Số bản ghi hợp lệ: {records}')
-        df = pd.DataFrame(data['Data'])
+        df = _records_to_df(data['Data'], _PRICE_HISTORY_FIELDS, _PRICE_HISTORY_DTYPES)
         try:
             # if change in columns list
             if 'ThayDoi' in df.columns:
                 # Extract change_pct in floating format from change column
+                # astype(str) keeps the .str accessor valid when the column is entirely null (float dtype)
                 df['change_pct'] = pd.to_numeric(
                                                     df['ThayDoi']
-                                                    .str.split('(', expand=True)[1]
-                                                    .str.replace(' %)', '', regex=False)
-                                                    .str.replace(')', '', regex=False)
-                                                    .str.strip(),
+                                                    .astype(str)
+                                                    .str.extract(_CHANGE_PCT_RE, expand=False)
+                                                    .str.replace(',', '.', regex=False),
                                                     errors='coerce'
                                                 ) / 100
         except:
@@ -110,19 +197,10 @@ class Trading:
         Return:
             - DataFrame: Dữ liệu lịch sử giá của mã chứng khoán.
         """
-        if limit is None:
-            limit = days_between(start=start, end=end, format='%Y-%m-%d')
-        # convert start and end string to %m/%d/%Y format
-        start = pd.to_datetime(start).strftime('%m/%d/%Y')
-        end = pd.to_datetime(end).strftime('%m/%d/%Y')
-        url = f"{self.base_url}/GDKhoiNgoai.ashx?Symbol={self.symbol}&StartDate={start}&EndDate={end}&PageIndex={page}&PageSize={limit}"
-        response = requests.request("GET", url, headers=self.headers)
-        if response.status_code != 200:
-            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.text}")
-        data = response.json()['Data']
+        data = self._get_page('GDKhoiNgoai.ashx', start, end, page, limit)
         records = data['TotalCount']
         logger.info(f'Lịch sử GD Nước ngoài:\nMã CK: {self.symbol}. Số bản ghi hợp lệ: {records}')
-        df = pd.DataFrame(data['Data'])
+        df = _records_to_df(data['Data'], list(_FOREIGN_TRADE_MAP), _FOREIGN_TRADE_DTYPES)
         df = self._df_standardized(df, _FOREIGN_TRADE_MAP)
         # drop change column
         try:
@@ -148,19 +226,10 @@ class Trading:
         Return:
             - DataFrame: Dữ liệu lịch sử giá của mã chứng khoán.
         """
-        if limit is None:
-            limit = days_between(start=start, end=end, format='%Y-%m-%d')
-        # convert start and end string to %m/%d/%Y format
-        start = pd.to_datetime(start).strftime('%m/%d/%Y')
-        end = pd.to_datetime(end).strftime('%m/%d/%Y')
-        url = f"{self.base_url}/GDTuDoanh.ashx?Symbol={self.symbol}&StartDate={start}&EndDate={end}&PageIndex={page}&PageSize={limit}"
-        response = requests.request("GET", url, headers=self.headers)
-        if response.status_code != 200:
-            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.text}")
-        data = response.json()['Data']
+        data = self._get_page('GDTuDoanh.ashx', start, end, page, limit)
         records = data['TotalCount']
         logger.info(f'Lịch sử GD Tự Doanh:\nMã CK: {self.symbol}. Số bản ghi hợp lệ: {records}')
-        df = pd.DataFrame(data['Data']['ListDataTudoanh'])
+        df = _records_to_df(data['Data']['ListDataTudoanh'], list(_PROP_TRADE_MAP), _PROP_TRADE_DTYPES)
         df = self._df_standardized(df, _PROP_TRADE_MAP)
         try:
             df.drop(columns='symbol', inplace=True)
@@ -185,19 +254,10 @@ class Trading:
         Return:
             - DataFrame: Dữ liệu lịch sử giá của mã chứng khoán.
         """
-        if limit is None:
-            limit = days_between(start=start, end=end, format='%Y-%m-%d')
-        # convert start and end string to %m/%d/%Y format
-        start = pd.to_datetime(start).strftime('%m/%d/%Y')
-        end = pd.to_datetime(end).strftime('%m/%d/%Y')
-        url = f"{self.base_url}/ThongKeDL.ashx?Symbol={self.symbol}&StartDate={start}&EndDate={end}&PageIndex={page}&PageSize={limit}"
-        response = requests.request("GET", url, headers=self.headers)
-        if response.status_code != 200:
-            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.text}")
-        data = response.json()['Data']
+        data = self._get_page('ThongKeDL.ashx', start, end, page, limit)
         records = data['TotalCount']
         logger.info(f'Thống kê đặt lệnh:\nMã CK: {self.symbol}. Số bản ghi hợp lệ: {records}')
-        df = pd.DataFrame(data['Data'])
+        df = _records_to_df(data['Data'], list(_ORDER_STATS_MAP), _ORDER_STATS_DTYPES)
         df = self._df_standardized(df, _ORDER_STATS_MAP)
         # drop change column
         try:
@@ -224,30 +284,56 @@ class Trading:
         Return:
             - DataFrame: Dữ liệu lịch sử giá của mã chứng khoán.
         """
-        if limit is None:
-            limit = days_between(start=start, end=end, format='%Y-%m-%d')
-        # convert start and end string to %m/%d/%Y format
-        start = pd.to_datetime(start).strftime('%m/%d/%Y')
-        end = pd.to_datetime(end).strftime('%m/%d/%Y')
-        url = f"{self.base_url}/GDCoDong.ashx?Symbol={self.symbol}&StartDate={start}&EndDate={end}&PageIndex={page}&PageSize={limit}"
-        response = requests.request("GET", url, headers=self.headers)
-        if response.status_code != 200:
-            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.text}")
-        data = response.json()['Data']
+        data = self._get_page('GDCoDong.ashx', start, end, page, limit)
         records = data['TotalCount']
         logger.info(f'Thống kê giao dịch Cổ Đông & Nội bộ:\nMã CK: {self.symbol}. Số bản ghi hợp lệ: {records}')
-        df = pd.DataFrame(data['Data'])
+        df = _records_to_df(data['Data'], list(_INSIDER_DEAL_MAP), _INSIDER_DEAL_DTYPES)
         df = self._df_standardized(df, _INSIDER_DEAL_MAP)
 
-        for col in ["plan_begin_date", "plan_end_date", "real_end_date", "published_date", "order_date"]:
-            df[col] = df[col].str.replace(r'\D', '', regex=True)
-            # Convert to numeric type before calling to_datetime
-            df[col] = pd.to_datetime(pd.to_numeric(df[col]), unit='ms')
-            # localize time to Asia/Ho_Chi_Minh and format
-            # df[col] = (df[col] + pd.Timedelta(hours=7)).dt.strftime('%Y-%m-%d')
+        # Dates come as Microsoft JSON timestamps '/Date(1234567890000)/': extract the epoch milliseconds in one pass per column
+        # astype(str) keeps the .str accessor valid when a column is entirely null (float dtype)
+        df = df.assign(**{col: pd.to_datetime(pd.to_numeric(df[col].astype(str).str.extract(_MS_DATE_RE, expand=False), errors='coerce'), unit='ms')
+                          for col in _INSIDER_DATE_COLUMNS if col in df.columns})
+        # localize time to Asia/Ho_Chi_Minh and format
+        # df[col] = (df[col] + pd.Timedelta(hours=7)).dt.strftime('%Y-%m-%d')
 
         # Set properties
         df.name = self.symbol
         df.category = 'insider_deals'
         df.source = 'CafeF'
-        return df
\ No newline at end of file
+        return df
+
+    def snapshot (self, start:str, end:str, page:Optional[int]=1, limit:Optional[Union[int, None]]=None, max_workers:int=5) -> Dict[str, pd.DataFrame]:
+        """
+        Truy xuất đồng thời dữ liệu từ cả 5 nguồn CafeF (lịch sử giá, GD nước ngoài, GD tự doanh, thống kê đặt lệnh, GD cổ đông & nội bộ) cho cùng khoảng thời gian.
+
+        Tham số:
+            - start (bắt buộc): Ngày bắt đầu lấy dữ liệu, định dạng YYYY-mm-dd.
+            - end (bắt buộc): Ngày kết thúc lấy dữ liệu, định dạng YYYY-mm-dd.
+            - page (tùy chọn): Trang hiện tại. Mặc định là 1.
+            - limit (tùy chọn): Số lượng dữ liệu trả về trong một lần request. Mặc định là None để đặt giới hạn tương ứng số ngày giữa khung thời gian start và end.
+            - max_workers (tùy chọn): Số luồng tải đồng thời tối đa. Mặc định là 5.
+        Return:
+            - Dict: Dữ liệu của từng loại, khóa là tên phương thức tương ứng.
+        """
+        tasks = {name: partial(getattr(self, name), start=start, end=end, page=page, limit=limit) for name in _SNAPSHOT_METHODS}
+        return run_concurrently(tasks, max_workers=max_workers)
+
+
+def fetch_many(symbols:List[str], method_name:str='price_history', max_workers:int=16, random_agent:bool=False, cache:bool=True, **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Truy xuất dữ liệu cho nhiều mã chứng khoán song song từ nguồn dữ liệu CafeF. Các request dùng chung kết nối của module.
+
+    Tham số:
+        - symbols (bắt buộc): Danh sách mã chứng khoán. Ví dụ ['ACB', 'VCB'].
+        - method_name (tùy chọn): Tên phương thức của Trading cần gọi: price_history, foreign_trade, prop_trade, order_stats, insider_deal. Mặc định là 'price_history'.
+        - max_workers (tùy chọn): Số luồng tải đồng thời tối đa. Mặc định là 16.
+        - random_agent (tùy chọn): Sử dụng user agent ngẫu nhiên. Mặc định là False.
+        - cache (tùy chọn): Dùng bộ nhớ đệm trên đĩa cho dữ liệu trả về. Mặc định là True.
+        - kwargs: Tham số truyền vào phương thức, ví dụ start, end.
+    Return:
+        - Dict: Dữ liệu của từng mã chứng khoán, khóa là mã chứng khoán.
+    """
+    tasks = {symbol.upper(): partial(getattr(Trading(symbol, random_agent=random_agent, cache=cache), method_name), **kwargs) for symbol in symbols}
+    return run_concurrently(tasks, max_workers=max_workers)
+
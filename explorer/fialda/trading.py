@@ -1,17 +1,31 @@
 from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
+from functools import partial, lru_cache
 from .const import _BASE_URL
 import pandas as pd
-import requests
 import json
 from vnai import agg_execution
 from vnstock.core.utils.parser import get_asset_type, camel_to_snake, flatten_data
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.user_agent import get_headers
 from vnstock_data.core.utils.validation import validate_date
+from vnstock_data.core.utils.parser import json_loads
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.concurrency import run_concurrently
 
 logger = get_logger(__name__)
 
+# Shared across Trading instances so paginated and per-symbol calls reuse the connection to fwtapi2.fialda.com
+_SESSION = build_session(pool_connections=10, pool_maxsize=20)
+
+
+@lru_cache(maxsize=32)
+def _column_mapping(columns:tuple) -> Dict[str, str]:
+    """
+    Build the rename mapping once per distinct column set; the API returns the same columns on every request.
+    """
+    return {col: camel_to_snake(col.replace('tT', 'deal').replace('kL_', '')) for col in columns}
+
 
 class Trading:
     """
@@ -54,21 +68,36 @@ class Trading:
                   'pageNumber': page,
                   'pageSize': limit}
 
-        response = requests.request("GET", url, headers=self.headers, params=params)
+        response = _SESSION.get(url, headers=self.headers, params=params, timeout=30)
 
         if response.status_code != 200:
             raise ValueError(f"Failed to get data from {url}. Error code: {response.status_code}")
         
-        data = response.json()
+        data = json_loads(response.content)
         logger.info('Total records: %s', data['result']['totalCount'])
 
         df = pd.DataFrame(data['result']['items'])
 
-        # replace tT with deal
-        df.columns = [col.replace('tT', 'deal') for col in df.columns]
-        df.columns = [col.replace('kL_', '') for col in df.columns]
-        df.columns = [camel_to_snake(col) for col in df.columns]
+        # replace tT with deal, strip kL_ and convert to snake_case in a single rename
+        df.rename(columns=_column_mapping(tuple(df.columns)), inplace=True)
 
         df.name = self.symbol
         return df
 
+
+def fetch_many(symbols:List[str], method_name:str='prop_trades', max_workers:int=16, random_agent:bool=False, **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Truy xuất dữ liệu cho nhiều mã chứng khoán song song từ nguồn dữ liệu Fialda. Các request dùng chung kết nối của module.
+
+    Tham số:
+        - symbols (bắt buộc): Danh sách mã chứng khoán. Ví dụ ['ACB', 'VCB'].
+        - method_name (tùy chọn): Tên phương thức của Trading cần gọi. Mặc định là 'prop_trades'.
+        - max_workers (tùy chọn): Số luồng tải đồng thời tối đa. Mặc định là 16.
+        - random_agent (tùy chọn): Sử dụng user agent ngẫu nhiên. Mặc định là False.
+        - kwargs: Tham số truyền vào phương thức, ví dụ start_date, end_date.
+    Return:
+        - Dict: Dữ liệu của từng mã chứng khoán, khóa là mã chứng khoán.
+    """
+    tasks = {symbol.upper(): partial(getattr(Trading(symbol, random_agent=random_agent), method_name), **kwargs) for symbol in symbols}
+    return run_concurrently(tasks, max_workers=max_workers)
+
@@ -1,26 +1,41 @@
 import pandas as pd
 from datetime import datetime
+from functools import partial, lru_cache
 from .spl_fetcher import SPLFetcher
+from .const import COMMODITY_TICKERS
 from typing import Dict, Any, Optional, List
 from vnai import agg_execution
+from vnstock_data.core.utils.concurrency import run_concurrently
+from vnstock_data.core.utils.cache import FileCache
 from vnstock.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_CACHE = FileCache('spl')
+# Windows reaching today may still get new bars; windows fetched after their end date are cached for good
+_RECENT_TTL = 4 * 3600
+
+@lru_cache(maxsize=256)
+def _date_to_ts(date_str: str) -> int:
+    """Convert a 'YYYY-MM-DD' string to a unix timestamp, memoized since the same bounds repeat across tickers."""
+    return int(datetime.strptime(date_str, "%Y-%m-%d").timestamp())
+
 class CommodityPrice:
     """
     Lớp cung cấp các phương thức để lấy dữ liệu giá hàng hóa từ nguồn SPL.
     """
 
-    def __init__(self, start: Optional[str] = None, end: Optional[str] = None, show_log: Optional[bool] = False):
+    def __init__(self, start: Optional[str] = None, end: Optional[str] = None, show_log: Optional[bool] = False, cache: bool = True):
         """
         Khởi tạo đối tượng CommodityPrice với tùy chọn ngày bắt đầu và kết thúc mặc định.
 
         Các tham số:
             start (str, optional): Ngày bắt đầu mặc định (định dạng 'YYYY-MM-DD'). Mặc định là None.
             end (str, optional): Ngày kết thúc mặc định (định dạng 'YYYY-MM-DD'). Mặc định là None.
+            cache (bool, optional): Dùng bộ nhớ đệm trên đĩa cho dữ liệu lịch sử. Mặc định là True.
         """
         self.fetcher = SPLFetcher()
+        self.cache = _CACHE if cache else None
         self.default_start = start
         self.default_end = end
 
@@ -52,15 +67,23 @@ class CommodityPrice:
         end = end or self.default_end
 
         if start:
-            params["from"] = int(datetime.strptime(start, "%Y-%m-%d").timestamp())
+            params["from"] = _date_to_ts(start)
         if end:
-            params["to"] = int(datetime.strptime(end, "%Y-%m-%d").timestamp())
+            params["to"] = _date_to_ts(end)
 
         self.fetcher.validate(params)
-        raw_data = self.fetcher.fetch(endpoint="/historical/prices/ohlcv", params=params)
-        df = self.fetcher.to_dataframe(raw_data["data"])
-        # convert time column from YYYY-mm-dd string to datetime
-        df["time"] = pd.to_datetime(df["time"])
+        cache_key = f"{ticker}|{start}|{end}|{interval}"
+        records = self.cache.get(cache_key) if self.cache is not None else None
+        if records is None:
+            raw_data = self.fetcher.fetch(endpoint="/historical/prices/ohlcv", params=params)
+            records = raw_data["data"]
+            if self.cache is not None:
+                # A window is final only if it was fetched after its end date had passed
+                ttl = _RECENT_TTL if not end or end >= datetime.now().strftime("%Y-%m-%d") else float('inf')
+                self.cache.set(cache_key, records, ttl=ttl)
+        else:
+            logger.debug(f"Cache hit: {cache_key}")
+        df = self.fetcher.to_dataframe(records)
         # set time as index
         df.set_index("time", inplace=True)
 
@@ -70,110 +93,132 @@ class CommodityPrice:
         return df
         
 
+    def _fetch_named(self, name: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """Lấy dữ liệu hàng hóa theo tên đăng ký trong COMMODITY_TICKERS."""
+        ticker, columns = COMMODITY_TICKERS[name]
+        return self._fetch_commodity(ticker, start, end, columns=columns)
+
+    @agg_execution("SPL.ext")
+    def fetch_many(self, names: List[str], start: Optional[str] = None, end: Optional[str] = None, max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Lấy dữ liệu nhiều loại hàng hóa song song.
+
+        Các tham số:
+            names (List[str]): Danh sách tên hàng hóa, ví dụ ['gold_global', 'oil_crude']. Xem COMMODITY_TICKERS để biết các tên hợp lệ.
+            start (str, optional): Ngày bắt đầu (định dạng 'YYYY-MM-DD'). Mặc định là giá trị khởi tạo của lớp.
+            end (str, optional): Ngày kết thúc (định dạng 'YYYY-MM-DD'). Mặc định là giá trị khởi tạo của lớp.
+            max_workers (int, optional): Số luồng tải đồng thời tối đa. Mặc định là 8.
+
+        Giá trị trả về:
+            Dict[str, pd.DataFrame]: Dữ liệu của từng hàng hóa, khóa là tên hàng hóa.
+        """
+        unknown = [name for name in names if name not in COMMODITY_TICKERS]
+        if unknown:
+            raise ValueError(f"Unknown commodity: {', '.join(unknown)}. Valid names: {', '.join(COMMODITY_TICKERS)}")
+        return run_concurrently({name: partial(self._fetch_named, name, start, end) for name in names}, max_workers=max_workers)
+
     def _gold_vn_buy(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá vàng Việt Nam (mua vào)."""
-        return self._fetch_commodity("GOLD:VN:BUY", start, end, columns=['close'])
+        return self._fetch_named('gold_vn_buy', start, end)
 
     def _gold_vn_sell(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá vàng Việt Nam (bán ra)."""
-        return self._fetch_commodity("GOLD:VN:SELL", start, end, columns=['close'])
+        return self._fetch_named('gold_vn_sell', start, end)
     
     @agg_execution("SPL.ext")
     def gold_vn(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá vàng Việt Nam."""
-        buy = self._gold_vn_buy(start, end)
-        sell = self._gold_vn_sell(start, end)
-        # return as Pandas DataFrame
-        df = pd.concat([buy, sell], axis=1)
-        df.columns = ["buy", "sell"]
-        return df
+        # Fetch both sides concurrently; each call is an independent HTTP round-trip
+        results = run_concurrently({'buy': partial(self._gold_vn_buy, start, end),
+                                    'sell': partial(self._gold_vn_sell, start, end)}, max_workers=2)
+        # Outer-align on time so dates quoted on only one side are kept
+        return pd.concat({'buy': results['buy']['close'], 'sell': results['sell']['close']}, axis=1)
 
     @agg_execution("SPL.ext")
     def gold_global(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá vàng thế giới."""
-        return self._fetch_commodity("GC=F", start, end)
+        return self._fetch_named('gold_global', start, end)
 
     @agg_execution("SPL.ext")
     def _gas_ron92(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá xăng RON92 tại Việt Nam."""
-        return self._fetch_commodity("GAS:RON92:VN", start, end, columns=['close'])
+        return self._fetch_named('gas_ron92', start, end)
 
     @agg_execution("SPL.ext")
     def _gas_ron95(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá xăng RON95 tại Việt Nam."""
-        return self._fetch_commodity("GAS:RON95:VN", start, end, columns=['close'])
+        return self._fetch_named('gas_ron95', start, end)
 
     @agg_execution("SPL.ext")
     def _oil_do(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá dầu DO tại Việt Nam."""
-        return self._fetch_commodity("GAS:DO:VN", start, end, columns=['close'])
+        return self._fetch_named('oil_do', start, end)
 
     @agg_execution("SPL.ext")
     def gas_vn(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá xăng và dầu DO tại Việt Nam."""
-        ron92 = self._gas_ron92(start, end)
-        ron95 = self._gas_ron95(start, end)
-        oil_do = self._oil_do(start, end)
-        df = pd.concat([ron95, ron92, oil_do], axis=1)
-        df.columns = ["ron95", "ron92", "oil_do"]
-        return df
+        results = run_concurrently({'ron92': partial(self._gas_ron92, start, end),
+                                    'ron95': partial(self._gas_ron95, start, end),
+                                    'oil_do': partial(self._oil_do, start, end)}, max_workers=3)
+        # Outer-align on time so dates present in only one series are kept
+        return pd.concat({name: results[name]['close'] for name in ('ron95', 'ron92', 'oil_do')}, axis=1)
 
     @agg_execution("SPL.ext")
     def oil_crude(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá dầu thô."""
-        return self._fetch_commodity("CL=F", start, end)
+        return self._fetch_named('oil_crude', start, end)
 
     @agg_execution("SPL.ext")
     def gas_natural(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá khí thiên nhiên."""
-        return self._fetch_commodity("NG=F", start, end)
+        return self._fetch_named('gas_natural', start, end)
 
     @agg_execution("SPL.ext")
     def coke(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá than cốc."""
-        return self._fetch_commodity("ICEEUR:NCF1!", start, end)
+        return self._fetch_named('coke', start, end)
 
     @agg_execution("SPL.ext")
     def steel_d10(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá thép D10 tại Việt Nam."""
-        return self._fetch_commodity("STEEL:D10:VN", start, end, columns=['close'])
+        return self._fetch_named('steel_d10', start, end)
 
     @agg_execution("SPL.ext")
     def iron_ore(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá quặng sắt."""
-        return self._fetch_commodity("COMEX:TIO1!", start, end)
+        return self._fetch_named('iron_ore', start, end)
 
     @agg_execution("SPL.ext")
     def steel_hrc(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá thép HRC."""
-        return self._fetch_commodity("COMEX:HRC1!", start, end)
+        return self._fetch_named('steel_hrc', start, end)
 
     @agg_execution("SPL.ext")
     def fertilizer_ure(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá phân ure."""
-        return self._fetch_commodity("CBOT:UME1!", start, end)
+        return self._fetch_named('fertilizer_ure', start, end)
 
     @agg_execution("SPL.ext")
     def soybean(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá đậu tương."""
-        return self._fetch_commodity("ZM=F", start, end)
+        return self._fetch_named('soybean', start, end)
 
     @agg_execution("SPL.ext")
     def corn(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá ngô (bắp)."""
-        return self._fetch_commodity("ZC=F", start, end)
+        return self._fetch_named('corn', start, end)
 
     @agg_execution("SPL.ext")
     def sugar(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá đường."""
-        return self._fetch_commodity("SB=F", start, end)
+        return self._fetch_named('sugar', start, end)
 
     @agg_execution("SPL.ext")
     def pork_north_vn(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá heo hơi miền Bắc Việt Nam."""
-        return self._fetch_commodity("PIG:NORTH:VN", start, end, columns=['close'])
+        return self._fetch_named('pork_north_vn', start, end)
 
     @agg_execution("SPL.ext")
     def pork_china(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
         """Lấy giá heo hơi Trung Quốc."""
-        return self._fetch_commodity("PIG:CHINA", start, end, columns=['close'])
+        return self._fetch_named('pork_china', start, end)
@@ -11,3 +11,25 @@ HEADERS = {
     "accept": "application/json",
     "user-agent": "vns_market_data/1.0",
 }
+
+# Commodity name -> (SPL ticker, columns to keep; None keeps all OHLCV columns)
+COMMODITY_TICKERS = {
+    "gold_vn_buy": ("GOLD:VN:BUY", ["close"]),
+    "gold_vn_sell": ("GOLD:VN:SELL", ["close"]),
+    "gold_global": ("GC=F", None),
+    "gas_ron92": ("GAS:RON92:VN", ["close"]),
+    "gas_ron95": ("GAS:RON95:VN", ["close"]),
+    "oil_do": ("GAS:DO:VN", ["close"]),
+    "oil_crude": ("CL=F", None),
+    "gas_natural": ("NG=F", None),
+    "coke": ("ICEEUR:NCF1!", None),
+    "steel_d10": ("STEEL:D10:VN", ["close"]),
+    "iron_ore": ("COMEX:TIO1!", None),
+    "steel_hrc": ("COMEX:HRC1!", None),
+    "fertilizer_ure": ("CBOT:UME1!", None),
+    "soybean": ("ZM=F", None),
+    "corn": ("ZC=F", None),
+    "sugar": ("SB=F", None),
+    "pork_north_vn": ("PIG:NORTH:VN", ["close"]),
+    "pork_china": ("PIG:CHINA", ["close"]),
+}
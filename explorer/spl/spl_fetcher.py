@@ -44,6 +44,6 @@ class SPLFetcher(Fetcher):
             pd.DataFrame: A Pandas DataFrame with columns ['time', 'open', 'high', 'low', 'close', 'volume'].
         """
         columns = ["time", "open", "high", "low", "close", "volume"]
-        df = pd.DataFrame(raw_data, columns=columns)
+        df = pd.DataFrame.from_records(raw_data, columns=columns)
         df["time"] = pd.to_datetime(df["time"], unit="s")
         return df
@@ -1,3 +1,3 @@
-from .trading import Trading
+from .trading import Trading, fetch_many
 from .quote import Quote
 from .financial import Finance
\ No newline at end of file
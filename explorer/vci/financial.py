@@ -10,7 +10,7 @@ from vnstock.explorer.vci import Company
 from vnstock.core.utils import client
 from vnstock.core.utils.parser import get_asset_type, camel_to_snake
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.user_agent import get_headers
 from vnstock.core.utils.transform import replace_in_column_names, flatten_hierarchical_index
 from vnai import agg_execution
 
@@ -13,7 +13,7 @@ from vnstock.explorer.vci.models import TickerModel
 from vnstock.core.utils.logger import get_logger
 from vnstock.core.utils.market import trading_hours
 from vnstock.core.utils.parser import get_asset_type
-from vnstock.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.user_agent import get_headers
 from vnstock.core.utils.client import send_request
 from vnstock.core.utils.transform import ohlc_to_df, intraday_to_df
 
@@ -1,16 +1,145 @@
 from typing import List, Dict, Optional
 from datetime import datetime
+from functools import partial
 import pandas as pd
-import requests
-import json
+import re
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
-from vnstock.core.utils.parser import get_asset_type, camel_to_snake, flatten_data
+from vnstock_data.core.utils.user_agent import get_headers
+from vnstock.core.utils.parser import flatten_data
 from vnstock.explorer.vci.const import _GRAPHQL_URL, _TRADING_URL
 from vnstock_data.core.utils.validation import validate_date
+from vnstock_data.core.utils.parser import get_asset_type, camel_to_snake, json_loads, json_dumps, records_to_df
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.concurrency import run_concurrently
 
 logger = get_logger(__name__)
 
+# Shared keep-alive pool for the GraphQL and trading endpoints; headers are passed per request
+_SESSION = build_session(pool_connections=4, pool_maxsize=16, max_retries=3)
+
+# GraphQL query for trading_stats; only the variables change per call
+_TRADING_STATS_QUERY = """query Query($ticker: String!, $offset: Int!, $offsetInsider: Int!, $limit: Int!, $fromDate: String!, $toDate: String!) {
+  TickerPriceHistory(
+    ticker: $ticker
+    offset: $offset
+    limit: $limit
+    fromDate: $fromDate
+    toDate: $toDate
+  ) {
+    history {
+      tradingDate
+      stockType
+      ceilingPrice
+      floorPrice
+      referencePrice
+      openPrice
+      closePrice
+      matchPrice
+      priceChange
+      percentPriceChange
+      highestPrice
+      lowestPrice
+      averagePrice
+      totalMatchVolume
+      totalMatchValue
+      totalDealVolume
+      totalDealValue
+      totalVolume
+      totalValue
+      foreignNetTradingVolume
+      foreignNetTradingValue
+      foreignBuyValueMatched
+      foreignBuyVolumeMatched
+      foreignSellValueMatched
+      foreignSellVolumeMatched
+      foreignBuyValueDeal
+      foreignBuyVolumeDeal
+      foreignSellValueDeal
+      foreignSellVolumeDeal
+      foreignBuyValueTotal
+      foreignBuyVolumeTotal
+      foreignSellValueTotal
+      foreignSellVolumeTotal
+      foreignTotalRoom
+      foreignCurrentRoom
+      foreignHoldingVolume
+      suspension
+      delist
+      haltResumeFlag
+      split
+      benefit
+      meeting
+      notice
+      totalTrade
+      totalBuyTrade
+      totalBuyTradeVolume
+      totalSellTrade
+      totalSellTradeVolume
+      referencePriceAdjusted
+      openPriceAdjusted
+      closePriceAdjusted
+      priceChangeAdjusted
+      percentPriceChangeAdjusted
+      highestPriceAdjusted
+      lowestPriceAdjusted
+      unMatchedBuyTradeVolume
+      unMatchedSellTradeVolume
+      difVolumeBuySell
+      averageVolumeBuyOrder
+      averageVolumeSellOrder
+      __typename
+    }
+    totalRecords
+    __typename
+  }
+  OrganizationDeals(
+    ticker: $ticker
+    offset: $offsetInsider
+    limit: $limit
+    fromDate: $fromDate
+    toDate: $toDate
+  ) {
+    history {
+      id
+      organCode
+      tradeTypeCode
+      dealTypeCode
+      actionTypeCode
+      tradeStatusCode
+      traderOrganCode
+      shareBeforeTrade
+      ownershipBeforeTrade
+      shareRegister
+      shareAcquire
+      shareAfterTrade
+      ownershipAfterTrade
+      startDate
+      endDate
+      sourceUrl
+      publicDate
+      ticker
+      traderPersonId
+      traderName
+      en_TraderName
+      positionShortName
+      en_PositionShortName
+      positionName
+      en_PositionName
+      __typename
+    }
+    totalRecords
+    __typename
+  }
+}
+"""
+
+# History fields of the query above, mapped once to their snake_case output names
+_TRADING_STATS_FIELDS = re.search(r'history \{(.*?)__typename', _TRADING_STATS_QUERY, re.S).group(1).split()
+_TRADING_STATS_RENAME = {field: camel_to_snake(field) for field in _TRADING_STATS_FIELDS}
+_TRADING_STATS_RENAME.update({'unMatchedBuyTradeVolume': 'unmatched_buy_trade_volume',
+                              'unMatchedSellTradeVolume': 'unmatched_sell_trade_volume',
+                              'tradingDate': 'time'})
+
 class Trading:
     """
     Truy xuất dữ liệu giao dịch của mã chứng khoán từ nguồn dữ liệu VCI.
@@ -41,46 +170,28 @@ class Trading:
             logger.error(f"Invalid date format. Please use the format YYYY-mm-dd.")
             return None
 
-        payload = "{\"query\":\"query Query($ticker: String!, $offset: Int!, $offsetInsider: Int!, $limit: Int!, $fromDate: String!, $toDate: String!) {\\n  TickerPriceHistory(\\n    ticker: $ticker\\n    offset: $offset\\n    limit: $limit\\n    fromDate: $fromDate\\n    toDate: $toDate\\n  ) {\\n    history {\\n      tradingDate\\n      stockType\\n      ceilingPrice\\n      floorPrice\\n      referencePrice\\n      openPrice\\n      closePrice\\n      matchPrice\\n      priceChange\\n      percentPriceChange\\n      highestPrice\\n      lowestPrice\\n      averagePrice\\n      totalMatchVolume\\n      totalMatchValue\\n      totalDealVolume\\n      totalDealValue\\n      totalVolume\\n      totalValue\\n      foreignNetTradingVolume\\n      foreignNetTradingValue\\n      foreignBuyValueMatched\\n      foreignBuyVolumeMatched\\n      foreignSellValueMatched\\n      foreignSellVolumeMatched\\n      foreignBuyValueDeal\\n      foreignBuyVolumeDeal\\n      foreignSellValueDeal\\n      foreignSellVolumeDeal\\n      foreignBuyValueTotal\\n      foreignBuyVolumeTotal\\n      foreignSellValueTotal\\n      foreignSellVolumeTotal\\n      foreignTotalRoom\\n      foreignCurrentRoom\\n      foreignHoldingVolume\\n      suspension\\n      delist\\n      haltResumeFlag\\n      split\\n      benefit\\n      meeting\\n      notice\\n      totalTrade\\n      totalBuyTrade\\n      totalBuyTradeVolume\\n      totalSellTrade\\n      totalSellTradeVolume\\n      referencePriceAdjusted\\n      openPriceAdjusted\\n      closePriceAdjusted\\n      priceChangeAdjusted\\n      percentPriceChangeAdjusted\\n      highestPriceAdjusted\\n      lowestPriceAdjusted\\n      unMatchedBuyTradeVolume\\n      unMatchedSellTradeVolume\\n      difVolumeBuySell\\n      averageVolumeBuyOrder\\n      averageVolumeSellOrder\\n      __typename\\n    }\\n    totalRecords\\n    __typename\\n  }\\n  OrganizationDeals(\\n    ticker: $ticker\\n    offset: $offsetInsider\\n    limit: $limit\\n    fromDate: $fromDate\\n    toDate: $toDate\\n  ) {\\n    history {\\n      id\\n      organCode\\n      tradeTypeCode\\n      dealTypeCode\\n      actionTypeCode\\n      tradeStatusCode\\n      traderOrganCode\\n      shareBeforeTrade\\n      ownershipBeforeTrade\\n      shareRegister\\n      shareAcquire\\n      shareAfterTrade\\n      ownershipAfterTrade\\n      startDate\\n      endDate\\n      sourceUrl\\n      publicDate\\n      ticker\\n      traderPersonId\\n      traderName\\n      en_TraderName\\n      positionShortName\\n      en_PositionShortName\\n      positionName\\n      en_PositionName\\n      __typename\\n    }\\n    totalRecords\\n    __typename\\n  }\\n}\\n\",\"variables\":{\"ticker\":\"VCI\",\"limit\":15,\"offset\":0,\"offsetInsider\":0,\"fromDate\":\"2000-01-01\",\"toDate\":\"2100-01-01\"}}"
-        payload_json = json.loads(payload)
-        payload_json['variables']['limit'] = limit
-        payload_json['variables']['ticker'] = self.symbol
-        payload_json['variables']['offset'] = offset
-        payload_json['variables']['fromDate'] = start
-        payload_json['variables']['toDate'] = end
-
-        # convert payload_json to string
-        payload_json = json.dumps(payload_json)
+        payload = {'query': _TRADING_STATS_QUERY,
+                   'variables': {'ticker': self.symbol, 'limit': limit, 'offset': offset, 'offsetInsider': 0,
+                                 'fromDate': start, 'toDate': end}}
 
         if self.show_log:
-            logger.info(f"Querying data from {url}, payload: {payload_json}")
+            logger.info(f"Querying data from {_GRAPHQL_URL}, payload: {payload}")
 
-        response = requests.post(_GRAPHQL_URL, data=payload_json, headers=self.headers)
+        response = _SESSION.post(_GRAPHQL_URL, data=json_dumps(payload), headers=self.headers)
         if response.status_code != 200:
             logger.error(f"Error {response.status_code}: {response.text}")
             return None
-        data = response.json()
+        data = json_loads(response.content)
 
         if self.show_log:
             logger.info(f"Response data: {data}")
 
         data = data['data']['TickerPriceHistory']['history']
-        df = pd.DataFrame(data)
+        df = records_to_df(data, exclude=['__typename', 'stockType'])
 
         try:
-            # drop columns: '__typename'
-            df = df.drop(columns=['__typename', 'stockType'])
-            # convert column names to snake case
-            df.columns = [camel_to_snake(col) for col in df.columns]
-            # rename columns: un_matched_buy_trade_volume, un_matched_sell_trade_volume
-            df = df.rename(columns={'un_matched_buy_trade_volume':'unmatched_buy_trade_volume', 
-                                    'un_matched_sell_trade_volume':'unmatched_sell_trade_volume',
-                                    'trading_date': 'time',
-                                    # 'open_price': 'open',
-                                    # 'close_price': 'close',
-                                    # 'highest_price': 'high',
-                                    # 'lowest_price': 'low',
-                                    })
+            # convert column names to snake case and apply the output names in one rename
+            df = df.rename(columns=_TRADING_STATS_RENAME)
 
             if dropna:
                 df = df.dropna(how='all')
@@ -88,13 +199,15 @@ class Trading:
                 # df = df[(df != 0).any(axis=1)]  # drop rows where all values are 0
                 
                 # # Handle columns where all values are zero
-                zero_columns = [col for col in df.columns if df[col].sum() == 0]
+                # one reduction over the numeric block, plus columns left entirely empty
+                sums = df.select_dtypes(include=['number', 'bool']).sum()
+                zero_columns = sums.index[sums == 0].union(df.columns[df.isna().all()])
                 df = df.drop(columns=zero_columns)
 
             # convert trading_date to datetime from unix timestamp
             df['time'] = pd.to_datetime(df['time'], unit='ms')
             # sort by time column
-            df = df.sort_values(by='time').reset_index(drop=True)
+            df = df.sort_values(by='time', ignore_index=True)
 
         except Exception as e:
             logger.error(f'Error details: {e}')
@@ -122,13 +235,13 @@ class Trading:
         if self.show_log:
             logger.info(f"Querying data from {url}, payload: {payload}")
 
-        response = requests.post(url, headers=self.headers, data=json.dumps(payload))
+        response = _SESSION.post(url, headers=self.headers, data=json_dumps(payload))
         
         if response.status_code != 200:
             logger.error(f"Error {response.status_code}: {response.text}")
             return None
         
-        data = response.json()[0]
+        data = json_loads(response.content)[0]
 
         if self.show_log:
             logger.info(f"Response data: {data}")
@@ -138,3 +251,19 @@ class Trading:
         match_info = data['matchPrice']
 
         return listing_info, bid_ask, match_info
+
+def fetch_many(symbols:List[str], method_name:str='trading_stats', max_workers:int=8, random_agent:bool=False, **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Truy xuất dữ liệu cho nhiều mã chứng khoán song song từ nguồn dữ liệu VCI. Các request dùng chung kết nối của module.
+
+    Tham số:
+        - symbols (bắt buộc): Danh sách mã chứng khoán. Ví dụ ['ACB', 'VCB'].
+        - method_name (tùy chọn): Tên phương thức của Trading cần gọi. Mặc định là 'trading_stats'.
+        - max_workers (tùy chọn): Số luồng tải đồng thời tối đa, giữ ở mức thấp để tránh bị giới hạn tần suất. Mặc định là 8.
+        - random_agent (tùy chọn): Sử dụng user agent ngẫu nhiên. Mặc định là False.
+        - kwargs: Tham số truyền vào phương thức, ví dụ start, end, limit.
+    Return:
+        - Dict: Dữ liệu của từng mã chứng khoán, khóa là mã chứng khoán.
+    """
+    tasks = {symbol.upper(): partial(getattr(Trading(symbol, random_agent=random_agent), method_name), **kwargs) for symbol in symbols}
+    return run_concurrently(tasks, max_workers=max_workers)
@@ -29,4 +29,11 @@ _ORDER_MATCH_MAPPING = {
 #  'ref_price',
 #  'am_pm',
 #  'matched_total_vol'
- }
\ No newline at end of file
+ }
+
+# Numeric columns of the intraday board after renaming, applied with a single astype
+_ORDER_MATCH_DTYPE = dict.fromkeys(['matched_price', 'matched_change', 'matched_vol', 'matched_total_vol', 'avg_price',
+                                    'ref_price', 'ceiling_price', 'floor_price', 'high_price', 'low_price',
+                                    'bid_price1', 'bid_price2', 'bid_price3', 'bid_vol1', 'bid_vol2', 'bid_vol3',
+                                    'offer_price1', 'offer_price2', 'offer_price3', 'offer_vol1', 'offer_vol2', 'offer_vol3',
+                                    'foreign_buy_vol', 'foreign_sell_vol'], 'float64')
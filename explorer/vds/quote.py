@@ -1,38 +1,62 @@
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import json
-import requests
+from functools import lru_cache
 import pandas as pd
 from vnai import agg_execution
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.parser import get_asset_type, camel_to_snake, flatten_data
+from vnstock.core.utils.parser import flatten_data
 from vnstock_data.core.utils.user_agent import get_headers
 from vnstock_data.core.utils.validation import validate_date
+from vnstock_data.core.utils.parser import get_asset_type, camel_to_snake, json_loads, records_to_df, session_closed
 from vnstock_data.core.utils.browser import get_cookie
-from vnstock_data.explorer.vds.const import _BASE_URL, _ORDER_MATCH_MAPPING
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.cache import FileCache
+from vnstock_data.explorer.vds.const import _BASE_URL, _ORDER_MATCH_MAPPING, _ORDER_MATCH_DTYPE
 
 logger = get_logger(__name__)
 
+# Shared keep-alive pool so repeated intraday queries reuse the TLS connection to livedragon
+_SESSION = build_session(pool_connections=4, pool_maxsize=16, max_retries=3)
+_CACHE = FileCache('vds')
+# Boards fetched before the session closes are still filling up; boards fetched after the close never change
+_TODAY_TTL = 60
+
+@lru_cache(maxsize=256)
+def _parse_date(date_str:str) -> datetime:
+    # memoized strptime; the same few dates are queried for many symbols
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+@lru_cache(maxsize=256)
+def _intraday_column(name:str) -> str:
+    # raw camelCase field -> final output name, resolved once per field
+    snake = camel_to_snake(name)
+    return _ORDER_MATCH_MAPPING.get(snake, snake)
+
 class Quote:
     """
     Truy xuất dữ liệu giao dịch của mã chứng khoán từ nguồn dữ liệu VDSC.
     """
-    def __init__(self, symbol:Optional[str], cookie=None, random_agent=False, show_log:Optional[bool]=False):
+    def __init__(self, symbol:Optional[str], cookie=None, random_agent=False, show_log:Optional[bool]=False, cache:bool=True):
         self.symbol = symbol.upper()
         self.asset_type = get_asset_type(self.symbol)
 
         self.headers = get_headers(data_source='VDS', random_agent=random_agent)
         self.headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=UTF-8'
-        if cookie is None:
-            cookie = get_cookie('https://livedragon.vdsc.com.vn/general/intradayBoard.rv', headers=self.headers)
-            self.headers['Cookie'] = cookie
-        else:
-            self.headers['Cookie'] = cookie
+        # The session cookie costs an extra round-trip, so it is only fetched once a request is actually sent
+        self._cookie = cookie
 
         if not show_log:
             logger.setLevel('CRITICAL')
             
         self.show_log = show_log
+        self.cache = _CACHE if cache else None
+
+    def _ensure_cookie(self):
+        """
+        Gắn cookie vào headers trước request đầu tiên, tự động lấy từ Live Dragon nếu không được truyền vào.
+        """
+        if self.headers.get('Cookie') is None:
+            self.headers['Cookie'] = self._cookie or get_cookie('https://livedragon.vdsc.com.vn/general/intradayBoard.rv', headers=self.headers)
 
     @agg_execution("VDS.ext")
     def intraday (self, date:Optional[str]=None):
@@ -49,30 +73,48 @@ class Quote:
             date_obj = datetime.now()   
         else:
             # Convert to datetime object
-            date_obj = datetime.strptime(date, "%Y-%m-%d")
+            date_obj = _parse_date(date)
 
         # Convert to desired format DD/MM/YYYY
         formatted_date_str = date_obj.strftime("%d/%m/%Y")
 
+        cache_key = f"{self.symbol}|{formatted_date_str}"
+        records = self.cache.get(cache_key) if self.cache is not None else None
+        if records is not None:
+            logger.debug(f'Cache hit: {cache_key}')
+            return self._to_df(records)
+
+        self._ensure_cookie()
         url = f"{_BASE_URL}general/intradaySearch.rv"
         payload = f"stockCode={self.symbol}&boardDate={formatted_date_str}"
 
         if self.show_log:
             logger.info(f'Request data to {url}, using payload as details: {payload}. Headers values: {self.headers}')
 
-        response = requests.request("POST", url, headers=self.headers, data=payload)
+        response = _SESSION.post(url, headers=self.headers, data=payload)
         if response.status_code != 200:
             logger.debug(f"Error: {response.text}")
 
-        data = response.json()
+        data = json_loads(response.content)
 
         if self.show_log:
             logger.info(data)
 
-        df = pd.DataFrame(data['list'])
-
-        df.columns = [camel_to_snake(col) for col in df.columns]
-        df.rename(columns=_ORDER_MATCH_MAPPING, inplace=True)
+        if self.cache is not None:
+            # Only a board fetched after its session closed is final; earlier snapshots are partial
+            ttl = float('inf') if session_closed(date_obj.date()) else _TODAY_TTL
+            self.cache.set(cache_key, data['list'], ttl=ttl)
+
+        return self._to_df(data['list'])
+
+    @staticmethod
+    def _to_df(records:List[Dict]) -> pd.DataFrame:
+        df = records_to_df(records)
+        df.rename(columns=_intraday_column, inplace=True)
+        try:
+            df = df.astype({col: dtype for col, dtype in _ORDER_MATCH_DTYPE.items() if col in df.columns}, copy=False)
+        except (ValueError, TypeError) as e:
+            logger.debug(f'Failed to apply predefined dtypes: {e}')
 
         return df
             
\ No newline at end of file
@@ -67,6 +67,8 @@ _INTRADAY_DTYPE = {
                     "accumulated_vol": "int64",
                 }
 
+_MATCH_TYPE_LABELS = {'PB': 'Buy', 'PS': 'Sell'}
+
 _TOP_STOCK_INDEX = {'VNINDEX': 'VNIndex',
                         'HNX': 'HNX',
                         'VN30': 'VN30'
@@ -89,3 +91,14 @@ _TOP_STOCK_COLS = {
                 'ptValAvgCr5D': 'deal_value_avg_5d',
                 'ptVolAvgCr5D': 'deal_volume_avg_5d'
             }
+
+# URL templates for TopStock, filled with str.format per call
+_TOP_URLS = {
+    'gainer': _INSIGHT_BASE + "/top_stocks?q=index:{code}~nmVolumeAvgCr20D:gte:10000~priceChgPctCr1D:gt:0&size={limit}&sort=priceChgPctCr1D",
+    'loser': _INSIGHT_BASE + "/top_stocks?q=index:{code}~nmVolumeAvgCr20D:gte:10000~priceChgPctCr1D:lt:0&size={limit}&sort=priceChgPctCr1D:asc",
+    'value': _INSIGHT_BASE + "/top_stocks?q=index:{code}~accumulatedVal:gt:0&size={limit}&sort=accumulatedVal",
+    'volume': _INSIGHT_BASE + "/top_stocks?q=index:{code}~nmVolumeAvgCr20D:gte:10000~nmVolNmVolAvg20DPctCr:gte:100&size={limit}&sort=nmVolNmVolAvg20DPctCr",
+    'deal': _INSIGHT_BASE + "/top_stocks?size={limit}&q=index:{code}~nmVolumeAvgCr20D:gte:10000&sort=ptVolTotalVolAvg20DPctCr",
+    'foreign_buy': _INSIGHT_BASE + "/foreigns?q=type:STOCK,IFC,ETF~netVal:gt:0~tradingDate:{date}&sort=tradingDate~netVal:desc&size={limit}&fields=code,netVal,tradingDate",
+    'foreign_sell': _INSIGHT_BASE + "/foreigns?q=type:STOCK,IFC,ETF~netVal:lt:0~tradingDate:{date}&sort=tradingDate~netVal:asc&size={limit}&fields=code,netVal,tradingDate",
+}
@@ -1,14 +1,33 @@
+import logging
 import pandas as pd
 import requests
-from typing import Union
+from typing import Dict, Union
+from functools import partial, lru_cache
 from datetime import datetime
 from vnai import agg_execution
-from vnstock_data.explorer.vnd.const import _INSIGHT_BASE, _TOP_STOCK_INDEX, _TOP_STOCK_COLS
+from vnstock_data.explorer.vnd.const import _INSIGHT_BASE, _TOP_STOCK_INDEX, _TOP_STOCK_COLS, _TOP_URLS
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.cache import FileCache
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.concurrency import run_concurrently
+from vnstock_data.core.utils.parser import json_loads, records_to_df
 
 logger = get_logger(__name__)
 
+# Shared keep-alive pool so repeated calls reuse the connection to VND; headers are passed per request
+_SESSION = build_session(pool_connections=4, pool_maxsize=16, max_retries=3)
+
+# Rankings move during the session, so entries are only reused for a minute
+_CACHE = FileCache('vnd/top_stock', ttl=60)
+
+@lru_cache(maxsize=32)
+def _to_index_code(name: str) -> str:
+    """
+    Map a user-supplied index name to the VND index code, memoized; unknown names fall back to 'VNIndex'.
+    """
+    return _TOP_STOCK_INDEX.get(name.upper(), 'VNIndex')
+
 class TopStock:
     """
     Lớp để lấy dữ liệu cổ phiếu hàng đầu từ API VND.
@@ -49,9 +68,12 @@ class TopStock:
 
     top_foreign_trade(trading_date: str, limit: int=10) -> pd.DataFrame:
         Lấy top 10 cổ phiếu có giá trị giao dịch ròng lớn nhất từ nhà đầu tư nước ngoài.
+
+    dashboard(index: str='VNINDEX', limit: int=10, include_foreign: bool=False, date: str=None) -> Dict[str, pd.DataFrame]:
+        Lấy đồng thời toàn bộ các bảng xếp hạng trên trong một lần gọi.
     """
 
-    def __init__(self, show_log: bool = False, random_agent: bool = False):
+    def __init__(self, show_log: bool = False, random_agent: bool = False, cache: bool = True):
         """
         Khởi tạo lớp TopStock với tùy chọn sử dụng user-agent ngẫu nhiên và hiển thị log.
 
@@ -61,15 +83,34 @@ class TopStock:
             Nếu True, hiển thị thông báo log.
         random_agent : bool, tùy chọn
             Nếu True, sử dụng user-agent ngẫu nhiên trong headers HTTP (mặc định là False).
+        cache : bool, tùy chọn
+            Nếu True, dùng lại dữ liệu đã tải trong bộ nhớ đệm ngắn hạn (mặc định là True).
         """
         self.show_log = show_log
         self.base_url = _INSIGHT_BASE
         self.headers = get_headers(data_source='VND', random_agent=random_agent)
         self.data_source = 'VND'
+        self.cache = _CACHE if cache else None
 
-        if not show_log:
+        # setLevel clears the logging cache of every logger, so only call it when the level actually changes
+        if not show_log and logger.level != logging.CRITICAL:
             logger.setLevel('CRITICAL')
 
+    def _get_json(self, url: str) -> dict:
+        """
+        Phương thức nội bộ gửi yêu cầu GET và trả về dữ liệu JSON, ưu tiên đọc từ bộ nhớ đệm nếu còn hiệu lực.
+        """
+        if self.cache is not None:
+            data = self.cache.get(url)
+            if data is not None:
+                return data
+        response = _SESSION.get(url, headers=self.headers)
+        response.raise_for_status()
+        data = json_loads(response.content)
+        if self.cache is not None:
+            self.cache.set(url, data)
+        return data
+
     def _fetch_data(self, url: str) -> pd.DataFrame:
         """
         Phương thức nội bộ để lấy dữ liệu từ URL đã cho và trả về dưới dạng DataFrame của pandas.
@@ -87,18 +128,16 @@ class TopStock:
         try:
             if self.show_log:
                 logger.info(f"Lấy dữ liệu từ URL: {url}")
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(url)
             if 'data' in data:
-                df = pd.DataFrame(data['data'])
+                df = records_to_df(data['data'])
                 # Rename columns using the provided dictionary
                 df.rename(columns=_TOP_STOCK_COLS, inplace=True)
                 return df
             else:
                 logger.error("Không có trường 'data' trong phản hồi JSON")
                 return pd.DataFrame()
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Lỗi khi lấy dữ liệu: {e}")
             return pd.DataFrame()
 
@@ -119,11 +158,9 @@ class TopStock:
         try:
             if self.show_log:
                 logger.info(f"Lấy dữ liệu từ URL: {url}")
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(url)
             if 'data' in data:
-                df = pd.DataFrame(data['data'])
+                df = records_to_df(data['data'])
                 # Rename columns specifically for foreign transaction data
                 df.rename(columns={
                     'code': 'symbol',
@@ -134,7 +171,7 @@ class TopStock:
             else:
                 logger.error("Không có trường 'data' trong phản hồi JSON")
                 return pd.DataFrame()
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Lỗi khi lấy dữ liệu: {e}")
             return pd.DataFrame()
 
@@ -152,7 +189,7 @@ class TopStock:
         str
             Mã chỉ số tương ứng (ví dụ: 'VNIndex').
         """
-        return _TOP_STOCK_INDEX.get(index.upper(), 'VNIndex')
+        return _to_index_code(index)
 
     @agg_execution("VND.ext")
     def gainer(self, index: str = 'VNINDEX', limit: int = 10) -> pd.DataFrame:
@@ -171,8 +208,7 @@ class TopStock:
         pd.DataFrame
             Một DataFrame chứa top cổ phiếu tăng giá.
         """
-        index_code = self._get_index_code(index)
-        url = f"{self.base_url}/top_stocks?q=index:{index_code}~nmVolumeAvgCr20D:gte:10000~priceChgPctCr1D:gt:0&size={limit}&sort=priceChgPctCr1D"
+        url = _TOP_URLS['gainer'].format(code=self._get_index_code(index), limit=limit)
         return self._fetch_data(url)
 
     @agg_execution("VND.ext")
@@ -192,8 +228,7 @@ class TopStock:
         pd.DataFrame
             Một DataFrame chứa top cổ phiếu giảm giá.
         """
-        index_code = self._get_index_code(index)
-        url = f"{self.base_url}/top_stocks?q=index:{index_code}~nmVolumeAvgCr20D:gte:10000~priceChgPctCr1D:lt:0&size={limit}&sort=priceChgPctCr1D:asc"
+        url = _TOP_URLS['loser'].format(code=self._get_index_code(index), limit=limit)
         return self._fetch_data(url)
 
     @agg_execution("VND.ext")
@@ -213,8 +248,7 @@ class TopStock:
         pd.DataFrame
             Một DataFrame chứa top cổ phiếu có giá trị giao dịch lớn nhất.
         """
-        index_code = self._get_index_code(index)
-        url = f"{self.base_url}/top_stocks?q=index:{index_code}~accumulatedVal:gt:0&size={limit}&sort=accumulatedVal"
+        url = _TOP_URLS['value'].format(code=self._get_index_code(index), limit=limit)
         return self._fetch_data(url)
 
     @agg_execution("VND.ext")
@@ -234,8 +268,7 @@ class TopStock:
         pd.DataFrame
             Một DataFrame chứa top cổ phiếu có khối lượng đột biến lớn nhất.
         """
-        index_code = self._get_index_code(index)
-        url = f"{self.base_url}/top_stocks?q=index:{index_code}~nmVolumeAvgCr20D:gte:10000~nmVolNmVolAvg20DPctCr:gte:100&size={limit}&sort=nmVolNmVolAvg20DPctCr"
+        url = _TOP_URLS['volume'].format(code=self._get_index_code(index), limit=limit)
         return self._fetch_data(url)
 
     @agg_execution("VND.ext")
@@ -255,8 +288,7 @@ class TopStock:
         pd.DataFrame
             Một DataFrame chứa top cổ phiếu có giao dịch thỏa thuận đột biến lớn nhất.
         """
-        index_code = self._get_index_code(index)
-        url = f"{self.base_url}/top_stocks?size={limit}&q=index:{index_code}~nmVolumeAvgCr20D:gte:10000&sort=ptVolTotalVolAvg20DPctCr"
+        url = _TOP_URLS['deal'].format(code=self._get_index_code(index), limit=limit)
         return self._fetch_data(url)
 
     @agg_execution("VND.ext")
@@ -279,7 +311,7 @@ class TopStock:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
 
-        url = f"https://api-finfo.vndirect.com.vn/v4/foreigns?q=type:STOCK,IFC,ETF~netVal:gt:0~tradingDate:{date}&sort=tradingDate~netVal:desc&size={limit}&fields=code,netVal,tradingDate"
+        url = _TOP_URLS['foreign_buy'].format(date=date, limit=limit)
         return self._fetch_foreign_data(url)
 
     @agg_execution("VND.ext")
@@ -302,5 +334,38 @@ class TopStock:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
 
-        url = f"https://api-finfo.vndirect.com.vn/v4/foreigns?q=type:STOCK,IFC,ETF~netVal:lt:0~tradingDate:{date}&sort=tradingDate~netVal:asc&size={limit}&fields=code,netVal,tradingDate"
+        url = _TOP_URLS['foreign_sell'].format(date=date, limit=limit)
         return self._fetch_foreign_data(url)
+
+    @agg_execution("VND.ext")
+    def dashboard(self, index: str = 'VNINDEX', limit: int = 10, include_foreign: bool = False, date: Union[str, None] = None, max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Lấy đồng thời các bảng xếp hạng gainer, loser, value, volume, deal (và tùy chọn foreign_buy, foreign_sell) trong một lần gọi.
+
+        Tham số:
+        -----------
+        index : str, tùy chọn
+            Tên chỉ số (mặc định là 'VNINDEX').
+        limit : int, tùy chọn
+            Số lượng cổ phiếu muốn lấy cho mỗi bảng (mặc định là 10).
+        include_foreign : bool, tùy chọn
+            Nếu True, lấy thêm top mua ròng và bán ròng của nhà đầu tư nước ngoài (mặc định là False).
+        date : str, tùy chọn
+            Ngày giao dịch cho dữ liệu nước ngoài dưới dạng 'YYYY-mm-dd'. Mặc định là ngày hiện tại.
+        max_workers : int, tùy chọn
+            Số luồng tải đồng thời tối đa (mặc định là 8).
+
+        Trả về:
+        --------
+        Dict[str, pd.DataFrame]
+            Dữ liệu của từng bảng xếp hạng, khóa là tên phương thức tương ứng.
+        """
+        index_code = self._get_index_code(index)
+        tasks = {name: partial(self._fetch_data, _TOP_URLS[name].format(code=index_code, limit=limit))
+                 for name in ('gainer', 'loser', 'value', 'volume', 'deal')}
+        if include_foreign:
+            if date is None:
+                date = datetime.now().strftime("%Y-%m-%d")
+            for name in ('foreign_buy', 'foreign_sell'):
+                tasks[name] = partial(self._fetch_foreign_data, _TOP_URLS[name].format(date=date, limit=limit))
+        return run_concurrently(tasks, max_workers=max_workers)
@@ -1,25 +1,37 @@
 # Đồ thị giá, đồ thị dư mua dư bán, đồ thị mức giá vs khối lượng, thống kê hành vi thị tường
+import logging
 from typing import Dict, Optional
 from datetime import datetime
 # from .const import _GROUP_CODE
-import requests
 import pandas as pd
 from vnai import agg_execution
-from vnstock.core.utils.parser import camel_to_snake
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.cache import FileCache
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.parser import camel_to_snake, json_loads, records_to_df, df_to_json
 
 logger = get_logger(__name__)
 
+# Shared keep-alive pool so repeated calls reuse the connection to VND; headers are passed per request
+_SESSION = build_session(pool_connections=4, pool_maxsize=16, max_retries=3)
+
+# The symbol list changes at most a few times a day
+_CACHE = FileCache('vnd/listing', ttl=24 * 3600)
+
+_SYMBOL_RENAME = {'floor': 'exchange', 'code': 'symbol'}
+
 class Listing:
     """
     Cấu hình truy cập dữ liệu lịch sử giá chứng khoán từ VCI.
     """
-    def __init__(self, random_agent:bool=False, show_log:bool=False):
+    def __init__(self, random_agent:bool=False, show_log:bool=False, cache:bool=True):
         self.data_source = 'VND'
         self.headers = get_headers(data_source=self.data_source, random_agent=random_agent)
+        self.cache = _CACHE if cache else None
         
-        if not show_log:
+        # setLevel clears the logging cache of every logger, so only call it when the level actually changes
+        if not show_log and logger.level != logging.CRITICAL:
             logger.setLevel('CRITICAL')
     
     @agg_execution("VND.ext")
@@ -42,31 +54,29 @@ class Listing:
         if show_log:
             logger.info(f'Requested URL: {url}')
 
-        response = requests.request("GET", url, headers=self.headers)
-
-        if response.status_code != 200:
-            raise ConnectionError(f"Failed to fetch data: {response.status_code} - {response.reason}")
-
-        json_data = response.json()
+        json_data = self.cache.get(url) if self.cache is not None else None
+        if json_data is None:
+            response = _SESSION.get(url, headers=self.headers)
 
-        df = pd.DataFrame(json_data['data'])
+            if response.status_code != 200:
+                raise ConnectionError(f"Failed to fetch data: {response.status_code} - {response.reason}")
 
-        # rename floor column to be exchange
-        if 'floor' in df.columns:
-            df = df.rename(columns={'floor':'exchange'})
+            json_data = json_loads(response.content)
+            if self.cache is not None:
+                self.cache.set(url, json_data)
 
-        # try to rename column code to symbol
-        if 'code' in df.columns:
-            df = df.rename(columns={'code':'symbol'})
+        df = records_to_df(json_data['data'])
 
         if to_df:
             if not json_data:
                 raise ValueError("JSON data is empty or not provided.")
-            # Convert camel to snake case
-            df.columns = [camel_to_snake(col) for col in df.columns]
+            # Rename floor/code to exchange/symbol and convert the rest from camel to snake case in one pass
+            df.rename(columns={col: _SYMBOL_RENAME.get(col) or camel_to_snake(col) for col in df.columns}, inplace=True)
             # Set metadata attributes
             df.source = "VND"
             return df
         else:
-            json_data = df.to_json(orient='records')
+            # rename ignores missing keys, so no need to check the columns first
+            df.rename(columns=_SYMBOL_RENAME, inplace=True)
+            json_data = df_to_json(df)
             return json_data
\ No newline at end of file
@@ -1,15 +1,26 @@
+import logging
 from typing import Optional
 from datetime import datetime, timedelta
+from functools import partial
 import requests
 import pandas as pd
 from vnai import agg_execution
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
-from vnstock_data.core.utils.parser import lookback_date
+from vnstock_data.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.parser import lookback_date, json_loads, records_to_df
+from vnstock_data.core.utils.concurrency import run_concurrently
+from vnstock_data.core.utils.cache import FileCache
+from vnstock_data.core.utils.session import build_session
 from vnstock_data.explorer.vnd.const import _INDEX_MAPPING
 
 logger = get_logger(__name__)
 
+# Shared keep-alive pool so repeated calls reuse the connection to VND; headers are passed per request
+_SESSION = build_session(pool_connections=4, pool_maxsize=16, max_retries=3)
+
+# Valuation ratios are published once per day
+_CACHE = FileCache('vnd/market', ttl=3600)
+
 class Market:
     """
     Provides market insights, including P/E and P/B ratios over time.
@@ -20,12 +31,14 @@ class Market:
         headers (dict): HTTP headers for API requests.
     """
 
-    def __init__(self, index: str = 'VNINDEX', random_agent: bool = False, show_log=False):
+    def __init__(self, index: str = 'VNINDEX', random_agent: bool = False, show_log=False, cache: bool = True):
         self.index = self._index_validation(index)
         self.base_url = "https://api-finfo.vndirect.com.vn/v4/ratios"
         self.headers = get_headers(data_source='VND', random_agent=random_agent)
+        self.cache = _CACHE if cache else None
         
-        if not show_log:
+        # setLevel clears the logging cache of every logger, so only call it when the level actually changes
+        if not show_log and logger.level != logging.CRITICAL:
             logger.setLevel('CRITICAL')
 
     def _index_validation(self, index: str) -> str:
@@ -62,23 +75,28 @@ class Market:
 
         try:
             logger.info(f"Fetching {ratio_code} data for index {self.index}...")
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json().get("data", [])
+            payload = self.cache.get(url) if self.cache is not None else None
+            if payload is None:
+                response = _SESSION.get(url, headers=self.headers)
+                response.raise_for_status()
+                payload = json_loads(response.content)
+                if self.cache is not None:
+                    self.cache.set(url, payload)
+            data = payload.get("data", [])
 
             if not data:
                 logger.warning("No data returned from API.")
                 return pd.DataFrame()
 
             # Convert data to DataFrame
-            df = pd.DataFrame(data)
-            df["reportDate"] = pd.to_datetime(df["reportDate"])
+            df = records_to_df(data)
+            df["reportDate"] = pd.to_datetime(df["reportDate"], format="%Y-%m-%d", cache=True)
             df = df.rename(columns={"value": ratio_code.lower()})
             # rename price_to_earnings to pe and price_to_book to pb
             df = df.rename(columns={'price_to_earnings': 'pe', 'price_to_book': 'pb'})
             return df.set_index("reportDate").sort_index()
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Failed to fetch data: {e}")
             return pd.DataFrame()
 
@@ -122,13 +140,15 @@ class Market:
             pd.DataFrame: A DataFrame containing P/E and P/B ratio data.
         """
         start_date = lookback_date(duration)
-        pe_data = self.pe(duration=duration)
-        pb_data = self.pb(duration=duration)
+        # P/E and P/B are independent requests, so fetch them side by side
+        results = run_concurrently({'pe': partial(self._fetch_data, ratio_code="PRICE_TO_EARNINGS", start_date=start_date),
+                                    'pb': partial(self._fetch_data, ratio_code="PRICE_TO_BOOK", start_date=start_date)}, max_workers=2)
+        pe_data, pb_data = results['pe'], results['pb']
 
         if pe_data.empty and pb_data.empty:
             logger.warning("No data available for both P/E and P/B ratios.")
             return pd.DataFrame()
 
-        # Merge P/E and P/B data
-        overview = pd.concat([pe_data, pb_data], axis=1)
+        # Merge P/E and P/B data: one frame built from the two index-aligned series
+        overview = pd.DataFrame({name: data[name] for name, data in (('pe', pe_data), ('pb', pb_data)) if name in data.columns})
         return overview
@@ -1,24 +1,66 @@
 """History module for vnd."""
 
 # Đồ thị giá, đồ thị dư mua dư bán, đồ thị mức giá vs khối lượng, thống kê hành vi thị tường
+import logging
 from typing import List, Dict, Optional
-from datetime import datetime
-from .const import _CHART_BASE, _INTERVAL_MAP, _OHLC_MAP, _OHLC_DTYPE, _INTRADAY_MAP, _INTRADAY_DTYPE, _INDEX_MAPPING
-from vnstock.explorer.vci.models import TickerModel
-import requests
+from datetime import date, datetime
+from functools import lru_cache
+from collections import namedtuple
+from .const import _CHART_BASE, _INTERVAL_MAP, _OHLC_MAP, _OHLC_DTYPE, _INTRADAY_MAP, _INTRADAY_DTYPE, _INDEX_MAPPING, _MATCH_TYPE_LABELS
+from vnstock.explorer.vci.models import TickerModel  # noqa: F401 - kept importable from this module
 import pandas as pd
 from vnai import agg_execution
 from vnstock.core.utils.parser import get_asset_type
 from vnstock.core.utils.logger import get_logger
-from vnstock.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.user_agent import get_headers
+from vnstock_data.core.utils.cache import FileCache
+from vnstock_data.core.utils.session import build_session
+from vnstock_data.core.utils.parser import json_loads, records_to_df, df_to_json, session_closed
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = get_logger(__name__)
 
+# Validated history arguments; a plain tuple instead of TickerModel keeps per-call validation cheap
+_TickerInput = namedtuple('_TickerInput', ['symbol', 'start', 'end', 'interval'])
+
+# Shared keep-alive pool so repeated calls reuse the connection to VND; headers are passed per request
+_SESSION = build_session(pool_connections=4, pool_maxsize=16, max_retries=3)
+
+_CACHE = FileCache('vnd/quote')
+# Lifetime of cached bars for windows whose end session has not closed yet: short for intraday resolutions, longer for daily and above
+_HISTORY_TTL = {'1m': 60, '5m': 60, '15m': 60, '30m': 60, '1H': 60, '1D': 3600, '1W': 3600, '1M': 3600}
+
+@lru_cache(maxsize=256)
+def _parse_date(date_str: str) -> date:
+    """Parse a 'YYYY-MM-DD' string, memoized since the same bounds repeat across symbols."""
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+@lru_cache(maxsize=256)
+def _date_to_ts(date_str: str) -> int:
+    """Convert a 'YYYY-MM-DD' string to a unix timestamp, memoized since the same bounds repeat across symbols."""
+    return int(datetime.strptime(date_str, "%Y-%m-%d").timestamp())
+
+def _stream_intraday_columns(response) -> Dict[str, list]:
+    """
+    Stream the 'data' rows of an intraday response straight into per-field column lists with ijson,
+    so the full list of row dicts is never held in memory. Every _INTRADAY_MAP field gets a column, None where a row lacks it.
+    """
+    response.raw.decode_content = True
+    columns = {field: [] for field in _INTRADAY_MAP}
+    for row in ijson.items(response.raw, 'data.item', use_float=True):
+        for field, values in columns.items():
+            values.append(row.get(field))
+    return columns
+
 class Quote:
     """
     VND data source for fetching stock market data, accommodating requests with large date ranges.
     """
-    def __init__(self, symbol:str, random_agent:bool=False, show_log:bool=False):
+    def __init__(self, symbol:str, random_agent:bool=False, show_log:bool=False, cache:bool=True):
         self.symbol = symbol.upper()
         self._history = None  # Cache for historical data
         self.asset_type = get_asset_type(self.symbol)
@@ -27,8 +69,10 @@ class Quote:
         self.headers = get_headers(data_source='VND', random_agent=random_agent)
         self.interval_map = _INTERVAL_MAP
         self.data_source = 'VND'
+        self.cache = _CACHE if cache else None
 
-        if not show_log:
+        # setLevel clears the logging cache of every logger, so only call it when the level actually changes
+        if not show_log and logger.level != logging.CRITICAL:
             logger.setLevel('CRITICAL')
 
         if 'INDEX' in self.symbol:
@@ -47,14 +91,16 @@ class Quote:
         """
         Validate input data
         """
-        # Validate input data
-        ticker = TickerModel(symbol=self.symbol, start=start, end=end, interval=interval)
-
         # if interval is not in the interval_map, raise an error
-        if ticker.interval not in self.interval_map:
-            raise ValueError(f"Giá trị interval không hợp lệ: {ticker.interval}. Vui lòng chọn: 1m, 5m, 15m, 30m, 1H, 1D, 1W, 1M")
-        
-        return ticker
+        if interval not in self.interval_map:
+            raise ValueError(f"Giá trị interval không hợp lệ: {interval}. Vui lòng chọn: 1m, 5m, 15m, 30m, 1H, 1D, 1W, 1M")
+
+        # Dates must be 'YYYY-MM-DD' strings; strptime raises ValueError/TypeError otherwise
+        datetime.strptime(start, '%Y-%m-%d')
+        if end:
+            datetime.strptime(end, '%Y-%m-%d')
+
+        return _TickerInput(self.symbol, start, end, interval)
 
     @agg_execution("VND.ext")
     def history(self, start: str, end: Optional[str], interval: Optional[str] = "1D", to_df: Optional[bool]=True, show_log: Optional[bool]=False, count_back: Optional[int]=None) -> Dict:
@@ -75,10 +121,10 @@ class Quote:
         if end is None:
             end_stamp = int(datetime.now().timestamp())
         else:
-            end_stamp = int(datetime.strptime(ticker.end, "%Y-%m-%d").timestamp())
+            end_stamp = _date_to_ts(ticker.end)
 
         # convert start and end date to timestamp
-        start_stamp = int(datetime.strptime(ticker.start, "%Y-%m-%d").timestamp())        
+        start_stamp = _date_to_ts(ticker.start)
         
         interval = self.interval_map[ticker.interval]
 
@@ -88,55 +134,64 @@ class Quote:
         if show_log:
             logger.info(f"Tải dữ liệu từ {url}")
 
-        # Send a GET request to fetch the data
-        response = requests.get(url, headers=self.headers)
+        # Open-ended windows are keyed without the moving end stamp
+        cache_key = f"history|{self.symbol}|{interval}|{start_stamp}|{end_stamp if end is not None else 'now'}"
+        json_data = self.cache.get(cache_key) if self.cache is not None else None
+
+        if json_data is None:
+            # Send a GET request to fetch the data
+            response = _SESSION.get(url, headers=self.headers)
 
-        if response.status_code != 200:
-            raise ConnectionError(f"Failed to fetch data: {response.status_code} - {response.reason}")
+            if response.status_code != 200:
+                raise ConnectionError(f"Failed to fetch data: {response.status_code} - {response.reason}")
 
-        json_data = response.json()
+            json_data = json_loads(response.content)
+            # Only cache complete bar data; error bodies such as {"s": "no_data"} must not be kept
+            if self.cache is not None and json_data.get('s') == 'ok' and json_data.get('t'):
+                # A window is final only if it was fetched after the session of its end date closed
+                final = end is not None and session_closed(_parse_date(ticker.end))
+                self.cache.set(cache_key, json_data, ttl=float('inf') if final else _HISTORY_TTL[ticker.interval])
 
         if show_log:
             logger.info(f'Truy xuất thành công dữ liệu {ticker.symbol} từ {ticker.start} đến {ticker.end}, khung thời gian {ticker.interval}.')
 
-        df = self._as_df(json_data, self.asset_type)
-
-        # if interval is note 1D, 1W, 1M, then add 7 hours to the time column
-        if ticker.interval not in ['1D', '1W', '1M']:
-            df['time'] = df['time'] + pd.Timedelta(hours=7)
-
-        if count_back is not None:
-            df = df.tail(count_back)
+        # if interval is not 1D, 1W, 1M, then shift the time column by 7 hours to Vietnam time
+        tz_offset = 7 * 3600 if ticker.interval not in ['1D', '1W', '1M'] else 0
+        df = self._as_df(json_data, self.asset_type, tz_offset=tz_offset, count_back=count_back)
 
         if to_df:
             return df
         else:
-            json_data = df.to_json(orient='records')
+            json_data = df_to_json(df)
             return json_data
     
-    def _as_df(self, history_data: Dict, asset_type: str) -> pd.DataFrame:
+    def _as_df(self, history_data: Dict, asset_type: str, tz_offset: int = 0, count_back: Optional[int] = None) -> pd.DataFrame:
         """
         Chuyển đổi dữ liệu lịch sử giá chứng khoán từ dạng JSON sang DataFrame.
 
         Tham số:
             - history_data: Dữ liệu lịch sử giá chứng khoán dạng JSON.
+            - tz_offset: Số giây cộng vào mốc thời gian unix trước khi chuyển đổi. Mặc định là 0.
+            - count_back: Chỉ giữ lại số bản ghi cuối cùng này, cắt trước khi tạo DataFrame. Mặc định là None (giữ tất cả).
         Trả về:
             - DataFrame: Dữ liệu lịch sử giá chứng khoán dưới dạng DataFrame.
         """
-        df = pd.DataFrame(history_data)
-
-        # drop s column
-        df.drop(columns=["s"], inplace=True)
+        # keep only the column arrays; the scalar status field 's' would otherwise be broadcast and dropped again
+        columns = {key: values for key, values in history_data.items() if isinstance(values, list)}
+        if count_back is not None:
+            # slice the raw arrays first so the discarded prefix is never converted
+            columns = {key: values[max(len(values) - count_back, 0):] for key, values in columns.items()}
+        df = pd.DataFrame(columns)
 
         # rename columns using OHLC_MAP
         df.rename(columns=_OHLC_MAP, inplace=True)
 
         # format the output by HistoryPriceModel
-        df["time"] = pd.to_datetime(df["time"], unit="s")
+        # shift the raw epoch seconds as integers, cheaper than adding a Timedelta to the datetime column
+        df["time"] = pd.to_datetime(df["time"].to_numpy(dtype="int64") + tz_offset, unit="s")
 
-        # set datatype for each column using history_price_dtype
-        for col, dtype in _OHLC_DTYPE.items():
-            df[col] = df[col].astype(dtype)
+        # set datatype for all columns at once using _OHLC_DTYPE
+        df = df.astype(_OHLC_DTYPE, copy=False)
 
         # Set metadata attributes
         df.attrs['name'] = self.symbol
@@ -146,7 +201,7 @@ class Quote:
         return df
 
     @agg_execution("VND.ext")
-    def intraday(self, page_size: Optional[int]=100000, to_df: Optional[bool]=True, show_log: bool=False) -> Dict:
+    def intraday(self, page_size: Optional[int]=100000, to_df: Optional[bool]=True, show_log: bool=False, categorical_match_type: bool=False) -> Dict:
         """
         Truy xuất dữ liệu khớp lệnh của mã chứng khoán bất kỳ từ nguồn dữ liệu VCI
 
@@ -155,6 +210,7 @@ class Quote:
             - trunc_time (tùy chọn): Thời gian cắt dữ liệu, dùng để lấy dữ liệu sau thời gian cắt. Mặc định là None.
             - to_df (tùy chọn): Chuyển đổi dữ liệu lịch sử trả về dưới dạng DataFrame. Mặc định là True. Đặt là False để trả về dữ liệu dạng JSON.
             - show_log (tùy chọn): Hiển thị thông tin log giúp debug dễ dàng. Mặc định là False.
+            - categorical_match_type (tùy chọn): Trả về cột match_type dạng category thay vì chuỗi, tiết kiệm bộ nhớ với dữ liệu lớn. Mặc định là False.
         """
         # if self.symbol is not defined, raise ValueError
         if self.symbol is None:
@@ -165,47 +221,55 @@ class Quote:
         if show_log:
             logger.info(f'Requested URL: {url}')
 
-        response = requests.get(url, headers=self.headers)
+        if ijson is not None:
+            # large page sizes are parsed incrementally into columns instead of a full list of dicts
+            with _SESSION.get(url, headers=self.headers, stream=True) as response:
+                if response.status_code != 200:
+                    raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.reason}")
+                columns = _stream_intraday_columns(response)
+            row_count = len(next(iter(columns.values()), []))
+            data = None
+        else:
+            response = _SESSION.get(url, headers=self.headers)
 
-        if response.status_code != 200:
-            raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.reason}")
+            if response.status_code != 200:
+                raise ConnectionError(f"Tải dữ liệu không thành công: {response.status_code} - {response.reason}")
 
-        data = response.json()['data']
+            data = json_loads(response.content)['data']
+            row_count = len(data)
 
         # if there is no data, return None
-        if len(data) == 0:
+        if row_count == 0:
             logger.warning(f"Dữ liệu {self.symbol} không có sẵn hoặc chưa đến thời gian khớp lệnh.")
             return None
 
         if show_log:
-            logger.info(data)
-
-        df = pd.DataFrame(data)
+            logger.info(data if data is not None else f'Đã nhận {row_count} bản ghi.')
 
-        drop_columns = ['tradingDate', 'time', 'adLast', 'code', 'floor']
-        for col in drop_columns:
-            df.drop(columns=col, inplace=True)
+        df = records_to_df(data) if data is not None else pd.DataFrame(columns)
 
-        # select columns in _INTRADAY_MAP values
-        # make sure columns from df are in _INTRADAY_MAP.keys()
-        df = df[df.columns.intersection(_INTRADAY_MAP.keys())]
-        # rename columns
-        df.rename(columns=_INTRADAY_MAP, inplace=True)
-        # replace b with Buy, s with Sell, unknown with ATO/ATC in match_type column
-        # if the match_type is exist then run replace, otherwise skip
+        # keep only the fields listed in _INTRADAY_MAP, in map order, and rename them in the same step
+        keep = [col for col in _INTRADAY_MAP if col in df.columns]
+        df = df[keep].rename(columns=_INTRADAY_MAP)
+        # replace PB with Buy, PS with Sell and keep other sides (ATO/ATC) as is
         if 'match_type' in df.columns:
-            df['match_type'] = df['match_type'].replace({'PB': 'Buy', 'PS': 'Sell'})
+            if categorical_match_type:
+                # a categorical column only relabels its few distinct values instead of every row
+                df['match_type'] = df['match_type'].astype('category').cat.rename_categories(_MATCH_TYPE_LABELS)
+            else:
+                df['match_type'] = df['match_type'].replace(_MATCH_TYPE_LABELS)
 
         # convert time to datetime
-        df['time'] = pd.to_datetime(df['time'])
+        df['time'] = pd.to_datetime(df['time'], cache=True)
 
         # sort by time
         df = df.sort_values(by='time').reset_index(drop=True)
 
         # apply _INTRADAY_DTYPE to columns for those columns available in _INTRADAY_DTYPE keys, ignore if not
-        for col, dtype in _INTRADAY_DTYPE.items():
-            if col in df.columns:
-                df[col] = df[col].astype(dtype)
+        dtypes = {col: dtype for col, dtype in _INTRADAY_DTYPE.items() if col in df.columns}
+        if categorical_match_type:
+            dtypes.pop('match_type', None)
+        df = df.astype(dtypes, copy=False)
 
         df.name = self.symbol
         df.category = self.asset_type
@@ -214,5 +278,5 @@ class Quote:
         if to_df:
             return df
         else:
-            json_data = df.to_json(orient='records')
+            json_data = df_to_json(df)
             return json_data
@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import types
+import tempfile
+import unittest
+import importlib
+import importlib.util
+from datetime import date, timedelta
+from unittest import mock
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+try:
+    import pandas as pd
+    import vnstock
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load(name):
+    """
+    Import a vnstock_data.core.utils submodule without running the package __init__ files,
+    which pull in every explorer and the vnii licence check.
+    """
+    for package in ('vnstock_data', 'vnstock_data.core', 'vnstock_data.core.utils'):
+        if package not in sys.modules:
+            module = types.ModuleType(package)
+            module.__path__ = [os.path.join(_ROOT, *package.split('.')[1:])]
+            sys.modules[package] = module
+    return importlib.import_module(f'vnstock_data.core.utils.{name}')
+
+
+def _load_file(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+if pd is not None:
+    cache = _load('cache')
+    parser = _load('parser')
+    validation = _load('validation')
+
+
+@unittest.skipIf(pd is None, 'vnstock and pandas are not installed')
+class FileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _cache(self, **kwargs):
+        return cache.FileCache('test', cache_dir=self._tmp.name, **kwargs)
+
+    def test_round_trip_from_memory_and_disk(self):
+        self._cache().set('k', {'a': [1, 2]})
+        self.assertEqual(self._cache().get('k'), {'a': [1, 2]})
+
+    def test_entries_expire(self):
+        with mock.patch.object(cache.time, 'time', return_value=1000.0):
+            store = self._cache(ttl=60)
+            store.set('k', 1)
+            store.set('short', 2, ttl=10)
+        with mock.patch.object(cache.time, 'time', return_value=1030.0):
+            self.assertEqual(store.get('k'), 1)
+            self.assertIsNone(store.get('short'))
+            self.assertIsNone(self._cache().get('short'))
+        with mock.patch.object(cache.time, 'time', return_value=1061.0):
+            self.assertIsNone(store.get('k'))
+            self.assertIsNone(self._cache().get('k'))
+
+    def test_permanent_entries_never_expire(self):
+        with mock.patch.object(cache.time, 'time', return_value=1000.0):
+            store = self._cache(ttl=60)
+            store.set('k', 'closed', ttl=float('inf'))
+        with open(store._path('k'), encoding='utf-8') as f:
+            self.assertIsNone(json.load(f)['expires'])
+        with mock.patch.object(cache.time, 'time', return_value=1000.0 + 10 ** 9):
+            self.assertEqual(store.get('k'), 'closed')
+            self.assertEqual(self._cache().get('k'), 'closed')
+
+    def test_memory_layer_evicts_least_recently_used(self):
+        store = self._cache(max_memory_entries=2)
+        store.set('a', 1)
+        store.set('b', 2)
+        store.get('a')
+        store.set('c', 3)
+        self.assertEqual(list(store._memory), ['a', 'c'])
+        # Evicted entries are still served from disk and become most recent again
+        self.assertEqual(store.get('b'), 2)
+        self.assertEqual(list(store._memory), ['c', 'b'])
+
+    def test_unreadable_files_are_misses(self):
+        store = self._cache()
+        os.makedirs(store.directory, exist_ok=True)
+        with open(store._path('corrupt'), 'wb') as f:
+            f.write(b'{"key": "corr')
+        # Entry written before expiries were recorded
+        with open(store._path('legacy'), 'w', encoding='utf-8') as f:
+            json.dump({'key': 'legacy', 'value': 1}, f)
+        # Hash collision: the file belongs to another key
+        with open(store._path('other'), 'w', encoding='utf-8') as f:
+            json.dump({'key': 'not-other', 'expires': None, 'value': 1}, f)
+        for key in ('corrupt', 'legacy', 'other', 'missing'):
+            self.assertIsNone(store.get(key), key)
+
+    def test_unserializable_value_is_not_written(self):
+        store = self._cache()
+        store.set('k', {1, 2})
+        self.assertEqual(os.listdir(store.directory), [])
+
+    def test_invalidate_by_prefix(self):
+        store = self._cache()
+        store.set('https://a/1', 1)
+        store.set('https://a/2', 2)
+        store.set('https://b/1', 3)
+        self.assertEqual(store.invalidate('https://a/'), 2)
+        self.assertIsNone(self._cache().get('https://a/1'))
+        self.assertIsNone(store.get('https://a/2'))
+        self.assertEqual(store.get('https://b/1'), 3)
+
+
+@unittest.skipIf(pd is None, 'vnstock and pandas are not installed')
+class ValidateDateTest(unittest.TestCase):
+    def test_valid_dates(self):
+        for value in ('2024-01-15', '2024-02-29', '2000-02-29', '2023-04-30', '2023-12-31', '2024-1-5', '2024-01-5'):
+            self.assertTrue(validation.validate_date(value), value)
+
+    def test_invalid_dates(self):
+        for value in ('2023-02-29', '1900-02-29', '2023-04-31', '2023-13-01', '2023-00-10', '2023-01-00',
+                      '2023-01-32', '23-01-01', '2023/01/01', '2023-01-01 ', '', None):
+            with self.assertLogs(validation.logger, level='ERROR'):
+                self.assertFalse(validation.validate_date(value), value)
+
+
+@unittest.skipIf(pd is None, 'vnstock and pandas are not installed')
+class RecordsToDfTest(unittest.TestCase):
+    RECORDS = [
+        {'symbol': 'FPT', 'price': 120, 'side': 'B'},
+        {'symbol': 'VNM', 'price': 65.2, 'volume': 200},
+        {'symbol': 'HPG', 'price': None, 'volume': 300, 'note': 'x'},
+    ]
+
+    def test_columns_are_the_union_of_keys(self):
+        df = parser.records_to_df(self.RECORDS)
+        self.assertEqual(list(df.columns), ['symbol', 'price', 'side', 'volume', 'note'])
+        self.assertEqual(df['volume'].tolist()[1:], [200, 300])
+        self.assertTrue(pd.isna(df.loc[0, 'volume']))
+
+    def test_exclude_ignores_absent_columns(self):
+        df = parser.records_to_df(self.RECORDS, exclude=['side', 'missing'])
+        self.assertEqual(list(df.columns), ['symbol', 'price', 'volume', 'note'])
+
+    def test_empty_records(self):
+        self.assertTrue(parser.records_to_df([], exclude=['a']).empty)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_path_matches_pandas(self):
+        cases = [
+            self.RECORDS,
+            [{'a': 1}, {'a': 'mixed'}],
+            [{'a': [1, 2], 'b': 1}],
+            [{'a': {'x': 1}}],
+            [{'a': True, 'b': None}, {'a': None, 'b': None}],
+        ]
+        for records in cases:
+            arrow_df = parser.records_to_df(records, exclude=['b'])
+            with mock.patch.object(parser, '_pyarrow', return_value=None):
+                pandas_df = parser.records_to_df(records, exclude=['b'])
+            pd.testing.assert_frame_equal(arrow_df, pandas_df)
+
+
+@unittest.skipIf(pd is None, 'vnstock and pandas are not installed')
+class JsonLoadsTest(unittest.TestCase):
+    PAYLOAD = '{"symbol": "FPT", "price": 120.5, "volume": 100, "tags": ["VN30", null], "name": "Tiền"}'
+    EXPECTED = {'symbol': 'FPT', 'price': 120.5, 'volume': 100, 'tags': ['VN30', None], 'name': 'Tiền'}
+
+    def _check(self, module):
+        self.assertEqual(module.json_loads(self.PAYLOAD), self.EXPECTED)
+        self.assertEqual(module.json_loads(self.PAYLOAD.encode('utf-8')), self.EXPECTED)
+        with self.assertRaises(ValueError):
+            module.json_loads(b'{"symbol": ')
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_with_orjson(self):
+        self.assertIsNotNone(parser._orjson)
+        self._check(parser)
+
+    def test_without_orjson(self):
+        # A None entry in sys.modules makes the import fail, as if orjson were not installed
+        with mock.patch.dict(sys.modules, {'orjson': None}):
+            fallback = _load_file('parser_without_orjson', parser.__file__)
+        self.assertIsNone(fallback._orjson)
+        self._check(fallback)
+
+
+@unittest.skipIf(pd is None, 'vnstock and pandas are not installed')
+class SessionClosedTest(unittest.TestCase):
+    def test_past_and_future_days(self):
+        today = date.today()
+        self.assertTrue(parser.session_closed(today - timedelta(days=2)))
+        self.assertFalse(parser.session_closed(today + timedelta(days=2)))
+
+    def test_closes_at_three_pm_vietnam_time(self):
+        day = date(2024, 6, 3)
+        # 14:59 and 15:00 in Vietnam (UTC+7)
+        for utc_hour, utc_minute, closed in ((7, 59, False), (8, 0, True)):
+            now = parser.datetime(2024, 6, 3, utc_hour, utc_minute, tzinfo=parser.timezone.utc)
+
+            class FrozenDatetime(parser.datetime):
+                @classmethod
+                def now(cls, tz=None):
+                    return now.astimezone(tz)
+
+            with mock.patch.object(parser, 'datetime', FrozenDatetime):
+                self.assertEqual(parser.session_closed(day), closed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import csv
+import tempfile
+import unittest
+import importlib.util
+
+# Load the module from its file so the test does not import the whole vnstock_data package
+_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'connector', 'dnse', 'ticks.py')
+_spec = importlib.util.spec_from_file_location('dnse_ticks', _PATH)
+ticks = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ticks)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def _payloads():
+    return [
+        {'symbol': 'FPT', 'matchPrice': 120.5, 'matchQtty': 100, 'time': '09:15:00', 'side': 'B'},
+        {'symbol': 'VNM', 'matchPrice': '65.2', 'matchQtty': '200', 'time': '09:15:01'},
+        {'symbol': 'HPG', 'matchPrice': 'n/a', 'matchQtty': 300, 'time': '09:15:02'},
+        {'symbol': 'MWG', 'matchPrice': 50.0, 'matchQtty': 0, 'time': '09:15:03'},
+        {'symbol': 'VN30F1M', 'open': 1300.0, 'close': 1301.5},
+    ]
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class ValidateTicksTest(unittest.TestCase):
+    def test_batch_is_coerced_and_filtered(self):
+        batch = [tick for tick in map(ticks._process_tick, _payloads()) if tick is not None]
+        self.assertEqual(len(batch), 4)
+
+        with self.assertLogs(level='ERROR'):
+            valid = ticks._validate_ticks(batch)
+
+        self.assertEqual([tick.symbol for tick in valid], ['FPT', 'VNM'])
+        self.assertEqual(valid[1].matchPrice, 65.2)
+        self.assertEqual(valid[1].matchQtty, 200.0)
+        self.assertIsInstance(valid[1].matchPrice, float)
+        self.assertIsNone(valid[1].side)
+
+    def test_optional_numeric_fields_are_coerced(self):
+        payload = {'symbol': 'FPT', 'matchPrice': 120.5, 'matchQtty': 100, 'open': '119.5', 'low': 'n/a', 'close': ''}
+        valid = ticks._validate_ticks([ticks._process_tick(payload)])
+
+        self.assertEqual(valid[0].open, 119.5)
+        self.assertIsNone(valid[0].low)
+        self.assertIsNone(valid[0].close)
+        self.assertIsNone(valid[0].high)
+
+    def test_csv_writer_round_trip(self):
+        valid = ticks._validate_ticks([ticks._process_tick(payload) for payload in _payloads()[:2]])
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'ticks.csv')
+            writer = ticks.open_tick_writer(filename)
+            self.assertIsInstance(writer, ticks.TickBatchWriter)
+            for tick in valid:
+                writer.write(tick)
+            writer.close()
+
+            with open(filename, newline='') as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(tuple(rows[0]), ticks.FIELDNAMES)
+        self.assertEqual(rows[0]['symbol'], 'FPT')
+        self.assertEqual(float(rows[1]['matchPrice']), 65.2)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_writer_round_trip(self):
+        payloads = _payloads()[:2]
+        payloads[1]['open'] = 'n/a'
+        valid = ticks._validate_ticks([ticks._process_tick(payload) for payload in payloads])
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'ticks.arrow')
+            writer = ticks.open_tick_writer(filename)
+            self.assertIsInstance(writer, ticks.TickArrowWriter)
+            for tick in valid:
+                writer.write(tick)
+            writer.close()
+
+            with pyarrow.OSFile(filename, 'rb') as source:
+                table = pyarrow.ipc.open_stream(source).read_all()
+
+        self.assertEqual(table.column_names, list(ticks.FIELDNAMES))
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column('matchQtty').to_pylist(), [100.0, 200.0])
+        self.assertEqual(table.column('side').to_pylist(), ['B', None])
+        self.assertEqual(table.column('open').to_pylist(), [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()